@@ -0,0 +1,138 @@
+import threading
+import time
+import cv2
+
+
+class CameraSource:
+    """Low-latency camera capture on a dedicated thread.
+
+    Negotiates a pixel format and frame rate with the driver, keeps the driver
+    queue as short as possible and only ever holds the newest frame. Each frame
+    is stamped with time.monotonic() right after it is grabbed so callers can
+    measure capture-to-display latency.
+    """
+    def __init__(self, device=0, width=1280, height=720, fps=30,
+                 formats=("MJPG", "YUYV"), buffer_size=1):
+        self.device = device
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.formats = formats
+        self.buffer_size = buffer_size
+
+        self.cap = None
+        self.negotiated = {}
+        self.dropped_frames = 0  # frames overwritten before anyone read them
+
+        self._frame = None
+        self._timestamp = 0.0
+        self._sequence = 0
+        self._last_read = 0
+        self._running = False
+        self._grab_exited = True
+        self._release_on_exit = False
+        self._thread = None
+        self._condition = threading.Condition()
+
+    def open(self):
+        """Open the device, negotiate format/FPS and start the grab thread"""
+        self.cap = cv2.VideoCapture(self.device)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open camera {self.device}")
+
+        # Try formats in order of preference; keep the first the driver accepts
+        for fmt in self.formats:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fmt))
+            if self._fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC)) == fmt:
+                break
+
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        # Not every backend honours this; the newest-frame thread bounds latency either way
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+
+        # Read back what the driver actually agreed to
+        self.negotiated = {
+            'format': self._fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.cap.get(cv2.CAP_PROP_FPS),
+            'buffer_size': int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE))
+        }
+
+        self._running = True
+        self._grab_exited = False
+        self._thread = threading.Thread(target=self._grab_loop, name="CameraSource", daemon=True)
+        self._thread.start()
+        return self
+
+    def _grab_loop(self):
+        """Continuously grab frames, keeping only the newest one"""
+        cap = self.cap
+        while self._running:
+            if not cap.grab():
+                break
+            timestamp = time.monotonic()
+            ret, frame = cap.retrieve()
+            if not ret:
+                continue
+
+            with self._condition:
+                if self._sequence > self._last_read:
+                    self.dropped_frames += 1
+                self._frame = frame
+                self._timestamp = timestamp
+                self._sequence += 1
+                self._condition.notify_all()
+
+        with self._condition:
+            self._running = False
+            self._grab_exited = True
+            self._condition.notify_all()
+            release = self._release_on_exit
+
+        # release() gave up waiting while grab() was blocked; close the device here instead
+        if release:
+            cap.release()
+
+    @property
+    def running(self):
+        """True until the grab thread stops (end of stream, device error or release())"""
+        return self._running
+
+    def read(self, timeout=2.0):
+        """Wait for a frame newer than the last one read.
+
+        Returns (ret, frame, timestamp) where timestamp is the monotonic grab time.
+        ret is False on timeout too; check running to tell a stall from the end of the stream.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._sequence > self._last_read or not self._running, timeout)
+            if self._sequence <= self._last_read:
+                return False, None, 0.0
+            self._last_read = self._sequence
+            return True, self._frame, self._timestamp
+
+    def release(self):
+        """Stop the grab thread and release the device"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            with self._condition:
+                if not self._grab_exited:
+                    # Still inside cap.grab(); the grab thread releases the device when it returns
+                    self._release_on_exit = True
+                    self.cap = None
+                    return
+            self._thread = None
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    @staticmethod
+    def _fourcc_to_str(value):
+        """Decode a CAP_PROP_FOURCC value into its four-character code"""
+        code = int(value)
+        return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
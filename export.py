@@ -0,0 +1,328 @@
+"""
+Offline video export for the Cybernetic AR HUD.
+
+Splits a recording into contiguous chunks and runs three passes:
+
+1. Track (worker processes): each chunk is tracked frame by frame from
+   freshly built MediaPipe graphs, after a short pre-roll, and its landmarks
+   and per-hand gestures are saved. Rebuilding the graphs costs a few hundred
+   milliseconds per chunk but keeps the output independent of which worker
+   rendered what before.
+2. Replay (parent): gesture-driven state (evolution progress, borg level,
+   scanning) is replayed over the whole video in order, so it carries across
+   chunk boundaries exactly as in the live loop.
+3. Render (worker processes): each chunk is drawn from its saved landmarks
+   and replayed state and encoded to a temporary file. The chunk files are
+   then stitched back together in their original order.
+
+Usage:
+    python export.py input.mp4 output.mp4 --workers 8
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from gesture_model import ArrayLandmarks, landmarks_to_array
+from hud import FRAME_COUNT_WRAP
+from utils import ConfigManager
+
+# Landmark counts per model (refined face mesh, hand, pose)
+FACE_POINTS = 478
+HAND_POINTS = 21
+POSE_POINTS = 33
+
+
+class VideoClock:
+    """Animation clock driven by the video timestamp instead of wall time"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def get_video_info(input_path):
+    """Read frame count, FPS and frame size from a video file"""
+    cap = cv2.VideoCapture(input_path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {input_path}")
+
+    info = {
+        'frame_count': int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        'fps': cap.get(cv2.CAP_PROP_FPS) or 30.0,
+        'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    }
+    cap.release()
+    return info
+
+
+def plan_chunks(frame_count, workers, min_chunk_frames=60):
+    """Split [0, frame_count) into ordered (start, end) chunks"""
+    if frame_count <= 0:
+        return []
+
+    # A few chunks per worker keeps the pool busy when chunks finish unevenly
+    num_chunks = max(1, min(workers * 4, frame_count // min_chunk_frames))
+    chunk_size = -(-frame_count // num_chunks)
+
+    return [(start, min(start + chunk_size, frame_count))
+            for start in range(0, frame_count, chunk_size)]
+
+
+# Per-process system, built once by init_worker and reused for every chunk
+_worker_system = None
+
+
+def init_worker():
+    """Pool initializer: load config and MediaPipe graphs once per worker process"""
+    # Imported here so the parent process never loads the MediaPipe graphs
+    from main import CyborgARSystem
+
+    global _worker_system
+    _worker_system = CyborgARSystem()
+    _worker_system.hud.clock = VideoClock()
+    _worker_system.show_fps = False
+    _worker_system.motion_gate = None  # offline export tracks every frame
+
+
+def worker_system():
+    """The worker's CyborgARSystem (built on first use outside a pool)"""
+    if _worker_system is None:
+        init_worker()
+    return _worker_system
+
+
+def track_chunk(job):
+    """Track one chunk from fresh graphs and save its landmarks (worker process).
+
+    Returns (index, gestures, centers) with one list of per-hand values per frame.
+    """
+    index, input_path, tracks_path, start, end, warmup_frames, mirror = job
+
+    system = worker_system()
+    system.reset_tracking()
+    recognizer = system.gesture_recognizer
+    max_hands = system.settings['max_hands']
+
+    count = end - start
+    faces = np.zeros((count, FACE_POINTS, 3), dtype=np.float32)
+    hands = np.zeros((count, max_hands, HAND_POINTS, 3), dtype=np.float32)
+    poses = np.zeros((count, POSE_POINTS, 3), dtype=np.float32)
+    has_face = np.zeros(count, dtype=bool)
+    has_pose = np.zeros(count, dtype=bool)
+    hand_count = np.zeros(count, dtype=np.int32)
+    gestures, centers = [], []
+
+    # Pre-roll a few frames before the chunk so tracking has locked on at the boundary
+    first = max(0, start - warmup_frames)
+    cap = cv2.VideoCapture(input_path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+
+    for frame_index in range(first, end):
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        if mirror:
+            frame = cv2.flip(frame, 1)
+
+        system.run_models(frame)
+        if frame_index < start:
+            continue
+
+        i = frame_index - start
+        face_landmarks = getattr(system.results['face'], 'multi_face_landmarks', None)
+        hand_landmarks = getattr(system.results['hands'], 'multi_hand_landmarks', None) or []
+        pose_landmarks = getattr(system.results['pose'], 'pose_landmarks', None)
+
+        if face_landmarks:
+            faces[i] = landmarks_to_array(face_landmarks[0])
+            has_face[i] = True
+        if pose_landmarks:
+            poses[i] = landmarks_to_array(pose_landmarks)
+            has_pose[i] = True
+
+        frame_hands = hand_landmarks[:max_hands]
+        for j, hand in enumerate(frame_hands):
+            hands[i, j] = landmarks_to_array(hand)
+        hand_count[i] = len(frame_hands)
+        gestures.append(recognizer.recognize_gestures(frame_hands))
+        centers.append([recognizer.get_hand_center(hand) for hand in frame_hands])
+
+    cap.release()
+
+    tracked = len(gestures)
+    np.savez(tracks_path, faces=faces[:tracked], hands=hands[:tracked], poses=poses[:tracked],
+             has_face=has_face[:tracked], has_pose=has_pose[:tracked], hand_count=hand_count[:tracked])
+    return index, gestures, centers
+
+
+def replay_state(tracked_chunks):
+    """Replay gesture-driven HUD state over every chunk in order (parent process).
+
+    Returns one list of per-frame draw_complete_hud state tuples per chunk.
+    """
+    from main import CyborgARSystem, DEFAULT_CONFIG_PATH
+
+    # Same config as the workers, minus the MediaPipe graphs: only the state logic runs here
+    config = ConfigManager(DEFAULT_CONFIG_PATH)
+    for name in ('face', 'hands', 'pose'):
+        config.set(f'models.{name}.enabled', False)
+    system = CyborgARSystem(config)
+    registry = system.hand_registry
+
+    states = []
+    for gestures, centers in tracked_chunks:
+        chunk_states = []
+        for frame_gestures, frame_centers in zip(gestures, centers):
+            registry.update(frame_centers, frame_gestures)
+            system.update_system_state()
+            chunk_states.append((system.cyborg_evolution, system.borg_level, system.current_gesture,
+                                 system.scanning_active, registry.detection_gestures()))
+        states.append(chunk_states)
+    return states
+
+
+def render_chunk(job):
+    """Draw the HUD over one tracked chunk and encode it (worker process)"""
+    index, input_path, tracks_path, chunk_path, start, states, mirror, fourcc = job
+
+    system = worker_system()
+    hud = system.hud
+    clock = hud.clock
+    hud.frame_count = start % FRAME_COUNT_WRAP
+
+    cap = cv2.VideoCapture(input_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    with np.load(tracks_path) as data:
+        tracks = {name: data[name] for name in data.files}
+
+    writer = cv2.VideoWriter(chunk_path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+    written = 0
+
+    for i, (cyborg_evolution, borg_level, gesture, scanning_active, hand_gestures) in enumerate(states):
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        if mirror:
+            frame = cv2.flip(frame, 1)
+
+        face_landmarks = [ArrayLandmarks(tracks['faces'][i])] if tracks['has_face'][i] else None
+        hand_landmarks = [ArrayLandmarks(points) for points in tracks['hands'][i, :tracks['hand_count'][i]]]
+        pose_landmarks = ArrayLandmarks(tracks['poses'][i]) if tracks['has_pose'][i] else None
+
+        clock.now = (start + i) / fps
+        system.face_geometry.update(face_landmarks[0] if face_landmarks else None, width, height)
+        frame = hud.draw_complete_hud(frame, face_landmarks, hand_landmarks or None, pose_landmarks,
+                                      cyborg_evolution, borg_level, gesture, face_landmarks is not None,
+                                      scanning_active, hand_gestures)
+        writer.write(frame)
+        written += 1
+
+    writer.release()
+    cap.release()
+    return index, chunk_path, written
+
+
+def concat_chunks(chunk_paths, output_path, fps, frame_size, fourcc):
+    """Join chunk files in order, stream-copying with ffmpeg when available"""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg:
+        list_path = output_path + ".chunks.txt"
+        with open(list_path, "w") as f:
+            for path in chunk_paths:
+                f.write(f"file '{os.path.abspath(path)}'\n")
+        try:
+            subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                            "-i", list_path, "-c", "copy", output_path], check=True)
+            return
+        except subprocess.CalledProcessError:
+            print("⚠️  ffmpeg concat failed, falling back to re-encoding")
+        finally:
+            os.remove(list_path)
+
+    # Fallback: decode and re-encode every chunk sequentially
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*fourcc), fps, frame_size)
+    for path in chunk_paths:
+        cap = cv2.VideoCapture(path)
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            writer.write(frame)
+        cap.release()
+    writer.release()
+
+
+def export_video(input_path, output_path, workers=None, warmup_frames=15,
+                 mirror=False, fourcc="mp4v"):
+    """Render the HUD over a recorded video using a pool of worker processes"""
+    info = get_video_info(input_path)
+    workers = workers or os.cpu_count() or 1
+    chunks = plan_chunks(info['frame_count'], workers)
+    if not chunks:
+        raise ValueError(f"No frames found in {input_path}")
+
+    print(f"🎞️  Exporting {info['frame_count']} frames in {len(chunks)} chunks "
+          f"across {workers} workers...")
+    start_time = time.time()
+
+    with tempfile.TemporaryDirectory(prefix="hud_export_") as tmp_dir:
+        ext = os.path.splitext(output_path)[1] or ".mp4"
+        tracks_paths = [os.path.join(tmp_dir, f"tracks_{i:05d}.npz") for i in range(len(chunks))]
+        chunk_paths = [os.path.join(tmp_dir, f"chunk_{i:05d}{ext}") for i in range(len(chunks))]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            track_jobs = [(i, input_path, tracks_paths[i], start, end, warmup_frames, mirror)
+                          for i, (start, end) in enumerate(chunks)]
+            tracked = [None] * len(chunks)
+            # Chunks finish out of order; slot each result back by its chunk index
+            for index, gestures, centers in pool.map(track_chunk, track_jobs):
+                tracked[index] = (gestures, centers)
+
+            # Gesture-driven state depends on every earlier frame, so replay it serially
+            states = replay_state(tracked)
+
+            render_jobs = [(i, input_path, tracks_paths[i], chunk_paths[i], start, states[i], mirror, fourcc)
+                           for i, (start, _) in enumerate(chunks)]
+            total_written = sum(written for _, _, written in pool.map(render_chunk, render_jobs))
+
+        concat_chunks(chunk_paths, output_path, info['fps'],
+                      (info['width'], info['height']), fourcc)
+
+    elapsed = time.time() - start_time
+    print(f"✅ Wrote {total_written} frames to {output_path} in {elapsed:.1f}s "
+          f"({total_written / max(elapsed, 1e-6):.1f} FPS)")
+    return total_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the Cybernetic AR HUD over a recorded video")
+    parser.add_argument("input", help="Input video file")
+    parser.add_argument("output", help="Output video file")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--warmup", type=int, default=15, help="Pre-roll frames tracked before each chunk")
+    parser.add_argument("--mirror", action="store_true", help="Flip frames horizontally like the live view")
+    parser.add_argument("--fourcc", default="mp4v", help="Output codec FourCC")
+    args = parser.parse_args()
+
+    export_video(args.input, args.output, workers=args.workers, warmup_frames=args.warmup,
+                 mirror=args.mirror, fourcc=args.fourcc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import math
+import numpy as np
+
+# MediaPipe face mesh landmark index sets (refined mesh, 478 points)
+FACE_OVAL = np.array([
+    10, 338, 297, 332, 284, 251, 389, 356, 454, 323, 361, 288, 397, 365, 379, 378, 400, 377,
+    152, 148, 176, 149, 150, 136, 172, 58, 132, 93, 234, 127, 162, 21, 54, 103, 67, 109
+])
+LEFT_EYE = np.array([362, 382, 381, 380, 374, 373, 390, 249, 263, 466, 388, 387, 386, 385, 384, 398])
+RIGHT_EYE = np.array([33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159, 160, 161, 246])
+LEFT_IRIS = np.array([473, 474, 475, 476, 477])
+RIGHT_IRIS = np.array([468, 469, 470, 471, 472])
+LIPS = np.array([61, 146, 91, 181, 84, 17, 314, 405, 321, 375, 291, 409, 270, 269, 267, 0, 37, 39, 40, 185])
+NOSE_TIP = np.array([1])
+
+# Eye aspect ratio points: outer corner, two upper lid, inner corner, two lower lid
+LEFT_EYE_EAR = np.array([263, 387, 385, 362, 380, 373])
+RIGHT_EYE_EAR = np.array([33, 160, 158, 133, 153, 144])
+
+# Every landmark any region needs; only these are read from the mesh each frame
+SUBSET = np.unique(np.concatenate([
+    FACE_OVAL, LEFT_EYE, RIGHT_EYE, LEFT_IRIS, RIGHT_IRIS, LIPS, NOSE_TIP, LEFT_EYE_EAR, RIGHT_EYE_EAR
+]))
+
+
+def _local(indices):
+    """Map mesh indices to row positions in the gathered SUBSET array"""
+    return np.searchsorted(SUBSET, indices)
+
+
+_OVAL = _local(FACE_OVAL)
+_LEFT_EYE = _local(LEFT_EYE)
+_RIGHT_EYE = _local(RIGHT_EYE)
+_LEFT_IRIS = _local(LEFT_IRIS)
+_RIGHT_IRIS = _local(RIGHT_IRIS)
+_LIPS = _local(LIPS)
+_LEFT_EAR = _local(LEFT_EYE_EAR)
+_RIGHT_EAR = _local(RIGHT_EYE_EAR)
+_FOREHEAD, _CHIN, _CHEEK_RIGHT, _CHEEK_LEFT, _NOSE = _local([10, 152, 234, 454, 1])
+
+
+class FaceGeometry:
+    """Per-frame face measurements computed once from landmark subsets.
+
+    Call update() with the current face landmarks; repeated calls with the same
+    landmarks object return the cached result, so every HUD element can ask for
+    the geometry without recomputing it.
+    """
+    def __init__(self):
+        self.points = np.zeros((SUBSET.size, 3), dtype=np.float32)  # pixel x, y and z (x scale)
+        self.valid = False
+        self._source = None
+        self._size = None
+
+        self.bbox = (0, 0, 0, 0)  # min_x, min_y, max_x, max_y
+        self.center = (0, 0)
+        self.yaw = 0.0
+        self.pitch = 0.0
+        self.roll = 0.0
+        self.left_eye_openness = 0.0
+        self.right_eye_openness = 0.0
+        self.left_iris = (0, 0)
+        self.right_iris = (0, 0)
+
+    def invalidate(self):
+        """Drop the cache so the next update() recomputes even for the same landmarks"""
+        self._source = None
+
+    def update(self, face_landmarks, width, height):
+        """Refresh geometry for a face (a single face's landmark list holder)"""
+        if face_landmarks is None:
+            self.valid = False
+            self._source = None
+            return self
+
+        # Cache hit: same landmarks object and frame size as the last call
+        if face_landmarks is self._source and self._size == (width, height):
+            return self
+
+        landmarks = face_landmarks.landmark
+        points = self.points
+        for row, index in enumerate(SUBSET):
+            lm = landmarks[index]
+            points[row, 0] = lm.x
+            points[row, 1] = lm.y
+            points[row, 2] = lm.z
+        points[:, 0] *= width
+        points[:, 1] *= height
+        points[:, 2] *= width
+
+        oval = points[_OVAL, :2]
+        min_x, min_y = oval.min(axis=0).astype(int)
+        max_x, max_y = oval.max(axis=0).astype(int)
+        self.bbox = (int(min_x), int(min_y), int(max_x), int(max_y))
+        self.center = ((self.bbox[0] + self.bbox[2]) // 2, (self.bbox[1] + self.bbox[3]) // 2)
+
+        self._update_head_pose()
+        self.left_eye_openness = self._eye_aspect_ratio(points[_LEFT_EAR, :2])
+        self.right_eye_openness = self._eye_aspect_ratio(points[_RIGHT_EAR, :2])
+
+        left_iris = points[_LEFT_IRIS[0], :2]
+        right_iris = points[_RIGHT_IRIS[0], :2]
+        self.left_iris = (int(left_iris[0]), int(left_iris[1]))
+        self.right_iris = (int(right_iris[0]), int(right_iris[1]))
+
+        self.valid = True
+        self._source = face_landmarks
+        self._size = (width, height)
+        return self
+
+    def _update_head_pose(self):
+        """Approximate yaw, pitch and roll (degrees) from the mesh depth values"""
+        p = self.points
+        cheek_dx = p[_CHEEK_LEFT] - p[_CHEEK_RIGHT]
+        vertical = p[_CHIN] - p[_FOREHEAD]
+
+        # Yaw: depth difference across the cheeks; pitch: depth difference forehead to chin
+        self.yaw = math.degrees(math.atan2(cheek_dx[2], cheek_dx[0]))
+        self.pitch = math.degrees(math.atan2(vertical[2], vertical[1]))
+
+        # Roll: tilt of the line between the outer eye corners
+        eye_line = p[_LEFT_EAR[0]] - p[_RIGHT_EAR[0]]
+        self.roll = math.degrees(math.atan2(eye_line[1], eye_line[0]))
+
+    @staticmethod
+    def _eye_aspect_ratio(eye):
+        """Eye aspect ratio: lid gap over eye width (~0.3 open, <0.15 closed)"""
+        vertical = np.linalg.norm(eye[1] - eye[5]) + np.linalg.norm(eye[2] - eye[4])
+        horizontal = np.linalg.norm(eye[0] - eye[3])
+        if horizontal == 0:
+            return 0.0
+        return float(vertical / (2.0 * horizontal))
+
+    def region(self, name):
+        """Pixel (x, y) points for a named region: oval, left_eye, right_eye, left_iris, right_iris, lips"""
+        indices = {
+            'oval': _OVAL,
+            'left_eye': _LEFT_EYE,
+            'right_eye': _RIGHT_EYE,
+            'left_iris': _LEFT_IRIS,
+            'right_iris': _RIGHT_IRIS,
+            'lips': _LIPS
+        }[name]
+        return self.points[indices, :2].astype(np.int32)
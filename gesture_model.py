@@ -0,0 +1,259 @@
+"""
+Data-driven gesture classifier trained from recorded hand landmarks.
+
+Hands are described by orientation-independent features (finger joint angles
+and fingertip distances normalized by palm size). Two NumPy-only models are
+supported, both reduced to a single linear layer at inference time:
+
+- centroid: nearest class centroid in standardized feature space
+- logistic: multinomial logistic regression
+
+Usage:
+    python gesture_model.py record session.npz        # label frames with keys 0-3
+    python gesture_model.py train gestures.npz session*.npz --kind logistic
+    python gesture_model.py compare gestures.npz session*.npz
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from utils import calculate_angles
+
+# Landmark chains from the wrist to each fingertip
+FINGER_CHAINS = (
+    (0, 1, 2, 3, 4),      # Thumb
+    (0, 5, 6, 7, 8),      # Index
+    (0, 9, 10, 11, 12),   # Middle
+    (0, 13, 14, 15, 16),  # Ring
+    (0, 17, 18, 19, 20)   # Pinky
+)
+
+# Angle triples (a, b, c): the angle at b for the three joints of every finger
+_ANGLE_A = np.array([chain[i - 1] for chain in FINGER_CHAINS for i in range(1, 4)])
+_ANGLE_B = np.array([chain[i] for chain in FINGER_CHAINS for i in range(1, 4)])
+_ANGLE_C = np.array([chain[i + 1] for chain in FINGER_CHAINS for i in range(1, 4)])
+_TIPS = np.array([4, 8, 12, 16, 20])
+
+# Keys used by the recorder to label the current hand
+RECORD_KEYS = {ord('0'): "unknown", ord('1'): "fist", ord('2'): "open_palm", ord('3'): "pinch"}
+
+
+def landmarks_to_array(hand_landmarks):
+    """(21, 3) array from a MediaPipe hand landmark list"""
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+
+
+def hand_features(points):
+    """Feature matrix (N, 25) for hands given as an (N, 21, >=2) landmark array"""
+    xy = np.asarray(points, dtype=np.float32)[:, :, :2]
+    palm = np.linalg.norm(xy[:, 9] - xy[:, 0], axis=-1)
+    palm = np.maximum(palm, 1e-6)[:, None]
+
+    angles = calculate_angles(xy[:, _ANGLE_A], xy[:, _ANGLE_B], xy[:, _ANGLE_C]) / 180.0
+    tips = xy[:, _TIPS]
+    tip_reach = np.linalg.norm(tips - xy[:, :1], axis=-1) / palm
+    tip_spread = np.linalg.norm(tips[:, 1:] - tips[:, :-1], axis=-1) / palm
+    pinch = np.linalg.norm(tips[:, 0] - tips[:, 1], axis=-1)[:, None] / palm
+
+    return np.concatenate([angles, tip_reach, tip_spread, pinch], axis=1).astype(np.float32)
+
+
+class GestureClassifier:
+    """Linear gesture classifier over standardized hand features"""
+    def __init__(self, classes, mean, scale, weights, bias, kind="logistic"):
+        self.classes = np.asarray(classes)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.kind = kind
+
+    @classmethod
+    def train(cls, features, labels, kind="logistic", iterations=500, learning_rate=0.5, l2=1e-3):
+        """Fit a classifier on (N, F) features and N string labels"""
+        classes, targets = np.unique(labels, return_inverse=True)
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0) + 1e-6
+        x = (features - mean) / scale
+
+        if kind == "centroid":
+            # argmin |x - c|^2 == argmax (2 c.x - |c|^2), so centroids fold into a linear layer
+            centroids = np.stack([x[targets == i].mean(axis=0) for i in range(len(classes))])
+            weights = 2.0 * centroids.T
+            bias = -np.sum(centroids ** 2, axis=1)
+
+        elif kind == "logistic":
+            n, f = x.shape
+            one_hot = np.eye(len(classes), dtype=np.float32)[targets]
+            weights = np.zeros((f, len(classes)), dtype=np.float32)
+            bias = np.zeros(len(classes), dtype=np.float32)
+            for _ in range(iterations):
+                logits = x @ weights + bias
+                logits -= logits.max(axis=1, keepdims=True)
+                probs = np.exp(logits)
+                probs /= probs.sum(axis=1, keepdims=True)
+                error = (probs - one_hot) / n
+                weights -= learning_rate * (x.T @ error + l2 * weights)
+                bias -= learning_rate * error.sum(axis=0)
+
+        else:
+            raise ValueError(f"Unknown classifier kind: {kind}")
+
+        return cls(classes, mean, scale, weights, bias, kind)
+
+    def predict_features(self, features):
+        """Class names for an (N, F) feature matrix"""
+        scores = ((features - self.mean) / self.scale) @ self.weights + self.bias
+        return self.classes[np.argmax(scores, axis=1)]
+
+    def predict(self, points):
+        """Class names for an (N, 21, 3) landmark array"""
+        return self.predict_features(hand_features(points))
+
+    def save(self, path):
+        """Write weights to a compact .npz file"""
+        np.savez(path, classes=self.classes, mean=self.mean, scale=self.scale,
+                 weights=self.weights, bias=self.bias, kind=np.array(self.kind))
+
+    @classmethod
+    def load(cls, path):
+        """Load weights written by save()"""
+        with np.load(path) as data:
+            return cls(data['classes'], data['mean'], data['scale'],
+                       data['weights'], data['bias'], str(data['kind']))
+
+
+def load_sessions(paths):
+    """Concatenate (landmarks, labels) from recorded session files"""
+    landmarks, labels = [], []
+    for path in paths:
+        with np.load(path) as data:
+            landmarks.append(data['landmarks'])
+            labels.append(data['labels'])
+    return np.concatenate(landmarks), np.concatenate(labels)
+
+
+class _Landmark:
+    """Attribute view of one landmark row"""
+    def __init__(self, row):
+        self.x, self.y, self.z = float(row[0]), float(row[1]), float(row[2])
+
+
+class ArrayLandmarks:
+    """MediaPipe-like landmark list built from an (N, 3) array"""
+    def __init__(self, points):
+        self.landmark = [_Landmark(row) for row in points]
+
+
+def record_session(output_path, camera_index=0):
+    """Record labelled hand landmarks from the camera (hold 0-3 to label, q to save)"""
+    import cv2
+    import mediapipe as mp
+
+    hands = mp.solutions.hands.Hands(max_num_hands=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+    cap = cv2.VideoCapture(camera_index)
+    landmarks, labels = [], []
+
+    print("🎥 Hold a key to label the visible hand: 0=unknown 1=fist 2=open_palm 3=pinch, q=save")
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame = cv2.flip(frame, 1)
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+        cv2.putText(frame, f"SAMPLES: {len(labels)}", (20, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+        cv2.imshow('Gesture Recorder', frame)
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            break
+        if key in RECORD_KEYS and results.multi_hand_landmarks:
+            landmarks.append(landmarks_to_array(results.multi_hand_landmarks[0]))
+            labels.append(RECORD_KEYS[key])
+
+    cap.release()
+    cv2.destroyAllWindows()
+    hands.close()
+
+    np.savez(output_path, landmarks=np.array(landmarks, dtype=np.float32).reshape(-1, 21, 3),
+             labels=np.array(labels))
+    print(f"💾 Saved {len(labels)} samples to {output_path}")
+
+
+def compare(classifier, landmarks, labels, repeats=20, hands_per_frame=2):
+    """Accuracy and per-hand latency of the rule-based recognizer vs the classifier.
+
+    Both are timed through GestureRecognizer.recognize_gestures on frames of
+    hands_per_frame landmark objects, the way process_frame calls them.
+    """
+    from gestures import GestureRecognizer
+
+    rules = GestureRecognizer()
+    model = GestureRecognizer()
+    model.set_classifier("<compare>", classifier)
+
+    hands = [ArrayLandmarks(points) for points in landmarks]
+    frames = [hands[i:i + hands_per_frame] for i in range(0, len(hands), hands_per_frame)]
+
+    results = {}
+    for name, recognizer in (('rules', rules), ('model', model)):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            predictions = [gesture for frame in frames for gesture in recognizer.recognize_gestures(frame)]
+        elapsed = (time.perf_counter() - start) / (repeats * len(hands))
+        results[name] = {'accuracy': float(np.mean(np.array(predictions) == labels)), 'us_per_hand': elapsed * 1e6}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and evaluate the data-driven gesture classifier")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record a labelled landmark session from the camera")
+    record.add_argument("output", help="Session .npz to write")
+    record.add_argument("--camera", type=int, default=0)
+
+    train = commands.add_parser("train", help="Train a classifier from recorded sessions")
+    train.add_argument("weights", help="Weights .npz to write")
+    train.add_argument("sessions", nargs="+", help="Recorded session .npz files")
+    train.add_argument("--kind", choices=("logistic", "centroid"), default="logistic")
+    train.add_argument("--holdout", type=float, default=0.2, help="Fraction held out for validation")
+
+    comp = commands.add_parser("compare", help="Compare accuracy and speed against the rule-based recognizer")
+    comp.add_argument("weights", help="Trained weights .npz")
+    comp.add_argument("sessions", nargs="+", help="Recorded session .npz files")
+    comp.add_argument("--hands-per-frame", type=int, choices=(1, 2), default=2,
+                      help="Hands passed per recognize_gestures call, as in the live loop")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record_session(args.output, args.camera)
+
+    elif args.command == "train":
+        landmarks, labels = load_sessions(args.sessions)
+        order = np.random.RandomState(0).permutation(len(labels))
+        split = int(len(order) * (1 - args.holdout))
+        train_idx, test_idx = order[:split], order[split:]
+
+        features = hand_features(landmarks)
+        classifier = GestureClassifier.train(features[train_idx], labels[train_idx], kind=args.kind)
+        classifier.save(args.weights)
+
+        if len(test_idx):
+            accuracy = np.mean(classifier.predict_features(features[test_idx]) == labels[test_idx])
+            print(f"🎯 Holdout accuracy: {accuracy:.1%} on {len(test_idx)} samples")
+        print(f"💾 Saved {args.kind} classifier ({', '.join(classifier.classes)}) to {args.weights}")
+
+    elif args.command == "compare":
+        landmarks, labels = load_sessions(args.sessions)
+        results = compare(GestureClassifier.load(args.weights), landmarks, labels,
+                          hands_per_frame=args.hands_per_frame)
+        for name, result in results.items():
+            print(f"{name:>6}: accuracy {result['accuracy']:.1%}, {result['us_per_hand']:.1f} µs/hand")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,35 @@
 import mediapipe as mp
 import numpy as np
 import math
+from gesture_model import GestureClassifier, landmarks_to_array
 
 class GestureRecognizer:
-    def __init__(self):
+    def __init__(self, model_path=None):
         self.mp_hands = mp.solutions.hands
+        self.classifier = None
+        self.model_path = None
+        self.load_model(model_path)
+    
+    def load_model(self, model_path):
+        """Use a trained classifier (see gesture_model.py) instead of the rules; None restores the rules"""
+        if model_path == self.model_path:
+            return
+        self.set_classifier(model_path, GestureClassifier.load(model_path) if model_path else None)
+    
+    def set_classifier(self, model_path, classifier):
+        """Install an already loaded classifier (None restores the rules)"""
+        self.classifier = classifier
+        self.model_path = model_path
+    
+    def recognize_gestures(self, hands):
+        """Recognize gestures for a list of hands, batched through the classifier when loaded"""
+        if not hands:
+            return []
+        if self.classifier is None:
+            return [self.recognize_gesture(hand) for hand in hands]
+        
+        points = np.stack([landmarks_to_array(hand) for hand in hands])
+        return [str(gesture) for gesture in self.classifier.predict(points)]
         
     def calculate_distance(self, point1, point2):
         """Calculate Euclidean distance between two points"""
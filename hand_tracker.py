@@ -0,0 +1,173 @@
+import numpy as np
+
+# Gesture names stored as small integer codes in the registry arrays
+GESTURES = ("none", "unknown", "fist", "open_palm", "pinch")
+GESTURE_CODES = {name: code for code, name in enumerate(GESTURES)}
+
+
+class HandRegistry:
+    """Track hands across frames with stable IDs and per-hand gesture state.
+
+    All per-hand data lives in fixed-size NumPy arrays indexed by slot, so a
+    frame update touches O(hands) entries and allocates no per-hand objects.
+    """
+    def __init__(self, max_hands=2, history_size=5, max_match_distance=0.2, max_missed_frames=5):
+        self.max_hands = max_hands
+        self.history_size = history_size
+        self.max_match_distance = max_match_distance
+        self.max_missed_frames = max_missed_frames
+
+        # Slot state
+        self.active = np.zeros(max_hands, dtype=bool)
+        self.ids = np.full(max_hands, -1, dtype=np.int32)
+        self.centers = np.zeros((max_hands, 2), dtype=np.float32)
+        self.missed = np.zeros(max_hands, dtype=np.int32)
+        self.seen = np.zeros(max_hands, dtype=bool)  # matched in the latest frame
+
+        # Per-hand gesture history (ring buffer of gesture codes) and state
+        self.gesture_history = np.zeros((max_hands, history_size), dtype=np.int8)
+        self.history_pos = np.zeros(max_hands, dtype=np.int32)
+        self.gestures = np.zeros(max_hands, dtype=np.int8)  # smoothed gesture per slot
+        self.evolution_progress = np.zeros(max_hands, dtype=np.float32)
+
+        # Detection index -> slot for the latest frame
+        self.detection_slots = np.full(max_hands, -1, dtype=np.int32)
+        self.num_detections = 0
+
+        # Scratch buffers reused every frame
+        self._det_centers = np.zeros((max_hands, 2), dtype=np.float32)
+        self._distances = np.zeros((max_hands, max_hands), dtype=np.float32)
+
+        # Two-hand interaction state
+        self.two_hand_gesture = "none"
+        self.hand_distance = 0.0
+        self.zoom_factor = 1.0
+        self._zoom_start_distance = 0.0
+
+        self._next_id = 0
+
+    def update(self, centers, gestures):
+        """Match this frame's hand centers to tracked hands and record gestures.
+
+        centers: sequence of (x, y) normalized hand centers (see GestureRecognizer.get_hand_center)
+        gestures: sequence of gesture names, one per center
+        """
+        n = min(len(centers), self.max_hands)
+        self.num_detections = n
+        self.detection_slots[:] = -1
+        self.seen[:] = False
+
+        for i in range(n):
+            self._det_centers[i] = centers[i]
+
+        if n:
+            # Nearest-centroid matching, greedy on the smallest distance first
+            dets = self._det_centers[:n]
+            dist = self._distances[:n]
+            np.subtract(dets[:, None, 0], self.centers[None, :, 0], out=dist)
+            np.square(dist, out=dist)
+            dist += np.square(dets[:, None, 1] - self.centers[None, :, 1])
+            np.sqrt(dist, out=dist)
+            dist[:, ~self.active] = np.inf
+
+            for _ in range(n):
+                flat = int(np.argmin(dist))
+                det, slot = divmod(flat, self.max_hands)
+                if not np.isfinite(dist[det, slot]) or dist[det, slot] > self.max_match_distance:
+                    break
+                self._assign(det, slot, new=False)
+                dist[det, :] = np.inf
+                dist[:, slot] = np.inf
+
+            # Unmatched detections become new hands in free slots
+            for det in range(n):
+                if self.detection_slots[det] >= 0:
+                    continue
+                free = np.flatnonzero(~self.active)
+                if free.size == 0:
+                    # Recycle the longest-missing hand that was not matched this frame
+                    free = np.flatnonzero(~self.seen)
+                    if free.size == 0:
+                        break
+                    free = free[np.argsort(-self.missed[free], kind="stable")]
+                self._assign(det, int(free[0]), new=True)
+
+            for det in range(n):
+                slot = self.detection_slots[det]
+                if slot >= 0:
+                    self._record_gesture(slot, GESTURE_CODES.get(gestures[det], GESTURE_CODES["unknown"]))
+
+        # Age out hands that were not seen this frame
+        lost = self.active & ~self.seen
+        self.missed[lost] += 1
+        expired = lost & (self.missed > self.max_missed_frames)
+        self.active[expired] = False
+        self.ids[expired] = -1
+
+        self._update_two_hand()
+        return self.detection_slots[:n]
+
+    def _assign(self, det, slot, new):
+        """Bind a detection to a slot, resetting state for newly seen hands"""
+        if new:
+            self.active[slot] = True
+            self.ids[slot] = self._next_id
+            self._next_id += 1
+            self.gesture_history[slot] = 0
+            self.history_pos[slot] = 0
+            self.evolution_progress[slot] = 0
+        self.centers[slot] = self._det_centers[det]
+        self.missed[slot] = 0
+        self.seen[slot] = True
+        self.detection_slots[det] = slot
+
+    def _record_gesture(self, slot, code):
+        """Push a gesture code into the slot's history and refresh its smoothed gesture"""
+        self.gesture_history[slot, self.history_pos[slot] % self.history_size] = code
+        self.history_pos[slot] += 1
+        filled = min(self.history_pos[slot], self.history_size)
+        # Majority vote over recent frames to suppress single-frame flicker
+        counts = np.bincount(self.gesture_history[slot, :filled], minlength=len(GESTURES))
+        self.gestures[slot] = int(np.argmax(counts))
+
+    def _update_two_hand(self):
+        """Derive two-hand gestures (pinch-zoom, spread) from the two visible hands"""
+        visible = np.flatnonzero(self.seen)
+        if visible.size < 2:
+            self.two_hand_gesture = "none"
+            self.hand_distance = 0.0
+            self.zoom_factor = 1.0
+            self._zoom_start_distance = 0.0
+            return
+
+        a, b = visible[0], visible[1]
+        self.hand_distance = float(np.hypot(*(self.centers[a] - self.centers[b])))
+        gesture_a, gesture_b = self.gestures[a], self.gestures[b]
+
+        if gesture_a == gesture_b == GESTURE_CODES["pinch"]:
+            if self.two_hand_gesture != "pinch_zoom":
+                self._zoom_start_distance = max(self.hand_distance, 1e-6)
+            self.two_hand_gesture = "pinch_zoom"
+            self.zoom_factor = self.hand_distance / self._zoom_start_distance
+        elif gesture_a == gesture_b == GESTURE_CODES["open_palm"]:
+            self.two_hand_gesture = "spread"
+            self.zoom_factor = 1.0
+        else:
+            self.two_hand_gesture = "none"
+            self.zoom_factor = 1.0
+
+    def gesture(self, slot):
+        """Smoothed gesture name for a slot"""
+        return GESTURES[self.gestures[slot]]
+
+    def detection_gestures(self):
+        """Smoothed gesture names for the latest frame's detections, in detection order"""
+        return [GESTURES[self.gestures[slot]] if slot >= 0 else "none"
+                for slot in self.detection_slots[:self.num_detections]]
+
+    def primary_slot(self):
+        """Slot of the longest-tracked visible hand, or -1"""
+        visible = np.flatnonzero(self.seen)
+        if visible.size == 0:
+            return -1
+        return int(visible[np.argmin(self.ids[visible])])
@@ -2,14 +2,30 @@ import cv2
 import numpy as np
 import math
 import time
+from face_geometry import FaceGeometry
+from utils import BloomPass
+
+FRAME_COUNT_WRAP = 1 << 30
+
+# HUD attributes that config.json may recolour
+COLOR_NAMES = ('cyan', 'green', 'red', 'orange', 'white', 'blue')
 
 class CyberneticHUD:
-    def __init__(self):
+    def __init__(self, clock=time.time):
+        # Animation clock (seconds); swap in a video timestamp for offline rendering
+        self.clock = clock
         self.frame_count = 0
+        # Shared per-frame face measurements (bbox, head pose, eyes)
+        self.face_geometry = FaceGeometry()
         self.pulse_time = 0
         self.scan_angle = 0
         self.circuit_alpha = 0.7
         
+        # Bloom post-process; glowing elements also draw into its emissive mask
+        self.bloom = BloomPass()
+        self.bloom_enabled = True
+        self._glow = None
+        
         # Colors (BGR format)
         self.cyan = (255, 255, 0)
         self.green = (0, 255, 0)
@@ -18,11 +34,39 @@ class CyberneticHUD:
         self.white = (255, 255, 255)
         self.blue = (255, 0, 0)
         
+        # Runtime-tunable settings (see apply_config)
+        self.animation_speed = 1.0
+        self.enabled = {}
+        
+    def apply_config(self, config):
+        """Apply colours, animation speed and element toggles from a config snapshot"""
+        colors = config.get('colors', {})
+        for name in COLOR_NAMES:
+            if name in colors:
+                setattr(self, name, tuple(colors[name]))
+        self.animation_speed = config.get('animation_speed', 1.0)
+        self.enabled = dict(config.get('hud', {}))
+        self.bloom_enabled = self.enabled.get('bloom', True)
+    
+    def is_enabled(self, element):
+        """Whether a HUD element is switched on (elements default to on)"""
+        return self.enabled.get(element, True)
+    
+    def anim_time(self):
+        """Animation time in seconds, scaled by the configured animation speed"""
+        return self.clock() * self.animation_speed
+    
+    def _layers(self, frame):
+        """Targets for glowing primitives: the frame, plus the bloom mask during draw_complete_hud"""
+        if self._glow is not None:
+            return (frame, self.bloom.emit())
+        return (frame,)
+    
     def draw_skeleton_arm(self, frame, pose_landmarks=None):
         """Draw the skeleton arm wireframe that tracks real arm movement"""
         height, width = frame.shape[:2]
         
-        pulse = abs(math.sin(time.time() * 2)) * 0.3 + 0.7
+        pulse = abs(math.sin(self.anim_time() * 2)) * 0.3 + 0.7
         arm_color = (int(255 * pulse), int(255 * pulse), int(255 * pulse))  # White pulsing
         
         if pose_landmarks:
@@ -114,7 +158,7 @@ class CyberneticHUD:
             (5, 7), (5, 8), (6, 7), (6, 8)
         ]
         
-        pulse = abs(math.sin(time.time() * 2)) * 0.5 + 0.5
+        pulse = abs(math.sin(self.anim_time() * 2)) * 0.5 + 0.5
         
         for start_idx, end_idx in connections:
             start = nodes[start_idx]
@@ -156,7 +200,7 @@ class CyberneticHUD:
             cv2.rectangle(frame, (x + 2, y + 2), (x + fill_width - 2, y + height - 2), color, -1)
         
         # Animated scan line
-        scan_pos = int((time.time() * 100) % width)
+        scan_pos = int((self.anim_time() * 100) % width)
         cv2.line(frame, (x + scan_pos, y), (x + scan_pos, y + height), self.white, 1)
         
         # Label
@@ -166,29 +210,30 @@ class CyberneticHUD:
     def draw_crosshair(self, frame, center, size=50):
         """Draw targeting crosshair"""
         x, y = center
-        pulse = abs(math.sin(time.time() * 3)) * 0.3 + 0.7
+        pulse = abs(math.sin(self.anim_time() * 3)) * 0.3 + 0.7
         color = (int(255 * pulse), 255, int(255 * pulse))
         
-        # Main cross
-        cv2.line(frame, (x - size, y), (x + size, y), color, 2)
-        cv2.line(frame, (x, y - size), (x, y + size), color, 2)
+        for layer in self._layers(frame):
+            # Main cross
+            cv2.line(layer, (x - size, y), (x + size, y), color, 2)
+            cv2.line(layer, (x, y - size), (x, y + size), color, 2)
         
-        # Corner brackets
-        bracket_size = size // 3
-        cv2.line(frame, (x - size, y - size), (x - size + bracket_size, y - size), color, 2)
-        cv2.line(frame, (x - size, y - size), (x - size, y - size + bracket_size), color, 2)
+            # Corner brackets
+            bracket_size = size // 3
+            cv2.line(layer, (x - size, y - size), (x - size + bracket_size, y - size), color, 2)
+            cv2.line(layer, (x - size, y - size), (x - size, y - size + bracket_size), color, 2)
         
-        cv2.line(frame, (x + size, y - size), (x + size - bracket_size, y - size), color, 2)
-        cv2.line(frame, (x + size, y - size), (x + size, y - size + bracket_size), color, 2)
+            cv2.line(layer, (x + size, y - size), (x + size - bracket_size, y - size), color, 2)
+            cv2.line(layer, (x + size, y - size), (x + size, y - size + bracket_size), color, 2)
         
-        cv2.line(frame, (x - size, y + size), (x - size + bracket_size, y + size), color, 2)
-        cv2.line(frame, (x - size, y + size), (x - size, y + size - bracket_size), color, 2)
+            cv2.line(layer, (x - size, y + size), (x - size + bracket_size, y + size), color, 2)
+            cv2.line(layer, (x - size, y + size), (x - size, y + size - bracket_size), color, 2)
         
-        cv2.line(frame, (x + size, y + size), (x + size - bracket_size, y + size), color, 2)
-        cv2.line(frame, (x + size, y + size), (x + size, y + size - bracket_size), color, 2)
+            cv2.line(layer, (x + size, y + size), (x + size - bracket_size, y + size), color, 2)
+            cv2.line(layer, (x + size, y + size), (x + size, y + size - bracket_size), color, 2)
         
-        # Center dot
-        cv2.circle(frame, (x, y), 3, color, -1)
+            # Center dot
+            cv2.circle(layer, (x, y), 3, color, -1)
     
     def draw_face_ar_overlay(self, frame, face_landmarks):
         """Draw face AR overlay exactly like reference images"""
@@ -197,24 +242,10 @@ class CyberneticHUD:
         
         height, width = frame.shape[:2]
         
-        # Get face bounding box
-        face_points = []
-        for landmark in face_landmarks[0].landmark:
-            x = int(landmark.x * width)
-            y = int(landmark.y * height)
-            face_points.append((x, y))
-        
-        if not face_points:
-            return
-        
-        # Calculate face center and bounds
-        min_x = min([p[0] for p in face_points])
-        max_x = max([p[0] for p in face_points])
-        min_y = min([p[1] for p in face_points])
-        max_y = max([p[1] for p in face_points])
-        
-        center_x = (min_x + max_x) // 2
-        center_y = (min_y + max_y) // 2
+        # Face bounds from the cached silhouette geometry
+        geometry = self.face_geometry.update(face_landmarks[0], width, height)
+        min_x, min_y, max_x, max_y = geometry.bbox
+        center_x, center_y = geometry.center
         
         # Main face rectangle frames (cyan like in reference)
         padding = 20
@@ -253,7 +284,7 @@ class CyberneticHUD:
         cv2.line(frame, (left_x + 10, center_y + 25), (left_x + side_width - 10, center_y + 25), self.cyan, 1)
         
         # Scanning lines effect
-        scan_y = int(min_y + (time.time() * 80) % (max_y - min_y))
+        scan_y = int(min_y + (self.anim_time() * 80) % max(1, max_y - min_y))
         cv2.line(frame, (min_x - padding, scan_y), (max_x + padding, scan_y), self.green, 1)
         
     def draw_scanning_effect(self, frame, face_landmarks):
@@ -263,27 +294,13 @@ class CyberneticHUD:
         
         height, width = frame.shape[:2]
         
-        # Get face bounding box
-        face_points = []
-        for landmark in face_landmarks[0].landmark:
-            x = int(landmark.x * width)
-            y = int(landmark.y * height)
-            face_points.append((x, y))
-        
-        if not face_points:
-            return
-        
-        # Calculate face center and bounds
-        min_x = min([p[0] for p in face_points])
-        max_x = max([p[0] for p in face_points])
-        min_y = min([p[1] for p in face_points])
-        max_y = max([p[1] for p in face_points])
-        
-        center_x = (min_x + max_x) // 2
-        center_y = (min_y + max_y) // 2
+        # Face bounds from the cached silhouette geometry
+        geometry = self.face_geometry.update(face_landmarks[0], width, height)
+        min_x, min_y, max_x, max_y = geometry.bbox
+        center_x, center_y = geometry.center
         
         # Animated scan lines
-        scan_y = int(min_y + (time.time() * 100) % (max_y - min_y))
+        scan_y = int(min_y + (self.anim_time() * 100) % max(1, max_y - min_y))
         cv2.line(frame, (min_x - 20, scan_y), (max_x + 20, scan_y), self.red, 2)
         
         # Face outline
@@ -297,6 +314,12 @@ class CyberneticHUD:
         # Scanning text
         cv2.putText(frame, "FACIAL RECOGNITION ACTIVE", 
                    (center_x - 100, min_y - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.red, 2)
+        
+        # Iris lock-on markers and head pose readout
+        cv2.circle(frame, geometry.left_iris, 6, self.red, 1)
+        cv2.circle(frame, geometry.right_iris, 6, self.red, 1)
+        cv2.putText(frame, f"YAW {geometry.yaw:+.0f}  PITCH {geometry.pitch:+.0f}  ROLL {geometry.roll:+.0f}", 
+                   (min_x - 10, max_y + 30), cv2.FONT_HERSHEY_SIMPLEX, 0.45, self.red, 1)
     
     def draw_circuit_overlay(self, frame, hand_landmarks):
         """Draw glowing circuit patterns around hands"""
@@ -306,38 +329,34 @@ class CyberneticHUD:
         height, width = frame.shape[:2]
         
         for hand in hand_landmarks:
-            # Get hand center
-            landmarks = []
-            for landmark in hand.landmark:
-                x = int(landmark.x * width)
-                y = int(landmark.y * height)
-                landmarks.append((x, y))
-            
+            # Get hand center (no per-frame list of pixel tuples)
+            landmarks = hand.landmark
             if len(landmarks) < 21:
                 continue
             
-            center_x = sum([p[0] for p in landmarks]) // len(landmarks)
-            center_y = sum([p[1] for p in landmarks]) // len(landmarks)
+            center_x = sum(int(landmark.x * width) for landmark in landmarks) // len(landmarks)
+            center_y = sum(int(landmark.y * height) for landmark in landmarks) // len(landmarks)
             
             # Draw circuit patterns
-            pulse = abs(math.sin(time.time() * 4)) * 0.5 + 0.5
+            pulse = abs(math.sin(self.anim_time() * 4)) * 0.5 + 0.5
             color = (int(255 * pulse), 255, int(255 * pulse))
             
-            # Radiating lines
-            for i in range(8):
-                angle = i * (2 * math.pi / 8)
-                end_x = int(center_x + 80 * math.cos(angle))
-                end_y = int(center_y + 80 * math.sin(angle))
-                cv2.line(frame, (center_x, center_y), (end_x, end_y), color, 2)
+            for layer in self._layers(frame):
+                # Radiating lines
+                for i in range(8):
+                    angle = i * (2 * math.pi / 8)
+                    end_x = int(center_x + 80 * math.cos(angle))
+                    end_y = int(center_y + 80 * math.sin(angle))
+                    cv2.line(layer, (center_x, center_y), (end_x, end_y), color, 2)
                 
-                # Circuit nodes
-                node_x = int(center_x + 60 * math.cos(angle))
-                node_y = int(center_y + 60 * math.sin(angle))
-                cv2.circle(frame, (node_x, node_y), 5, color, -1)
+                    # Circuit nodes
+                    node_x = int(center_x + 60 * math.cos(angle))
+                    node_y = int(center_y + 60 * math.sin(angle))
+                    cv2.circle(layer, (node_x, node_y), 5, color, -1)
             
-            # Central hub
-            cv2.circle(frame, (center_x, center_y), 15, color, 3)
-            cv2.circle(frame, (center_x, center_y), 8, self.white, -1)
+                # Central hub
+                cv2.circle(layer, (center_x, center_y), 15, color, 3)
+                cv2.circle(layer, (center_x, center_y), 8, self.white, -1)
     
     def draw_system_info(self, frame):
         """Draw system information panel"""
@@ -349,10 +368,10 @@ class CyberneticHUD:
         panel_width = 250
         panel_height = 200
         
-        # Semi-transparent background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        # Semi-transparent background: darken only the panel region in place
+        # (same result as blending a black-filled full-frame copy at 0.7)
+        panel = frame[max(0, panel_y):panel_y + panel_height + 1, max(0, panel_x):panel_x + panel_width + 1]
+        cv2.convertScaleAbs(panel, dst=panel, alpha=0.3)
         
         # Panel border
         cv2.rectangle(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height), self.cyan, 2)
@@ -365,7 +384,7 @@ class CyberneticHUD:
         status_lines = [
             "NEURAL LINK: ACTIVE",
             "BIOMETRIC SCAN: OK",
-            f"TIMESTAMP: {int(time.time())}",
+            f"TIMESTAMP: {int(self.clock())}",
             "PROTOCOL: BORG-VII",
             "STATUS: OPERATIONAL"
         ]
@@ -375,34 +394,49 @@ class CyberneticHUD:
             cv2.putText(frame, line, (panel_x + 10, y_pos), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, self.green, 1)
     
-    def draw_complete_hud(self, frame, face_landmarks, hand_landmarks, pose_landmarks, cyborg_evolution, borg_level, gesture, face_detected, scanning_active):
+    def draw_complete_hud(self, frame, face_landmarks, hand_landmarks, pose_landmarks, cyborg_evolution, borg_level, gesture, face_detected, scanning_active, hand_gestures=None):
         """Draw the complete HUD overlay"""
         height, width = frame.shape[:2]
+        self._glow = self.bloom.begin(frame) if self.bloom_enabled else None
         
         # Skeleton arm wireframe that follows your real arm movement
-        self.draw_skeleton_arm(frame, pose_landmarks)
+        if self.is_enabled('skeleton_arm'):
+            self.draw_skeleton_arm(frame, pose_landmarks)
         
         # Neural network (left side, below skeleton arm)
-        self.draw_neural_network(frame, x_offset=50, y_offset=350)
+        if self.is_enabled('neural_network'):
+            self.draw_neural_network(frame, x_offset=50, y_offset=350)
         
         # Face AR overlay (always show when face detected)
-        if face_landmarks:
+        if face_landmarks and self.is_enabled('face_overlay'):
             self.draw_face_ar_overlay(frame, face_landmarks)
         
         # Progress bars (right side, matching reference images)
-        self.draw_progress_bar(frame, width - 350, height - 150, 300, 20, cyborg_evolution, "cyborg evolution", self.orange)
-        self.draw_progress_bar(frame, width - 350, height - 100, 300, 20, borg_level * 10, "borg evolution level", self.orange)
+        if self.is_enabled('progress_bars'):
+            self.draw_progress_bar(frame, width - 350, height - 150, 300, 20, cyborg_evolution, "cyborg evolution", self.orange)
+            self.draw_progress_bar(frame, width - 350, height - 100, 300, 20, borg_level * 10, "borg evolution level", self.orange)
         
         # System info panel
-        self.draw_system_info(frame)
+        if self.is_enabled('system_info'):
+            self.draw_system_info(frame)
         
         # Face scanning effects (only when pinching)
-        if scanning_active and face_landmarks:
+        if scanning_active and face_landmarks and self.is_enabled('scanning_effect'):
             self.draw_scanning_effect(frame, face_landmarks)
         
-        # Circuit overlays for open palm gesture
-        if gesture == "open_palm":
-            self.draw_circuit_overlay(frame, hand_landmarks)
+        # Circuit overlays for each hand showing an open palm
+        if self.is_enabled('circuit_overlay'):
+            if hand_gestures is not None:
+                palms = [hand for hand, hand_gesture in zip(hand_landmarks or [], hand_gestures)
+                         if hand_gesture == "open_palm"]
+                self.draw_circuit_overlay(frame, palms)
+            elif gesture == "open_palm":
+                self.draw_circuit_overlay(frame, hand_landmarks)
+        
+        # Single bloom pass over everything that glowed this frame
+        if self._glow is not None:
+            self.bloom.apply(frame)
+            self._glow = None
         
         # Corner crosshairs (like in reference)
         corner_size = 20
@@ -434,5 +468,6 @@ class CyberneticHUD:
         cv2.putText(frame, f"ARM TRACKING: {pose_status}", (width - 250, 30), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, pose_color, 2)
         
-        self.frame_count += 1
+        # Wrap so a HUD left running for days keeps a small counter
+        self.frame_count = (self.frame_count + 1) % FRAME_COUNT_WRAP
         return frame
\ No newline at end of file
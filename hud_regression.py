@@ -0,0 +1,254 @@
+"""
+Golden-frame and performance regression harness for CyberneticHUD.
+
+Renders draw_complete_hud over fixed synthetic landmarks with a frozen
+animation clock, compares each frame against a stored golden image and times
+every draw method against a wall-clock budget. Needs no camera or display.
+
+Usage:
+    python hud_regression.py --update     # (re)record golden images
+    python hud_regression.py              # compare + check budgets
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from hud import CyberneticHUD
+
+FROZEN_TIME = 1700000000.25
+FRAME_SIZE = (720, 1280)
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+# Median wall-clock budgets per draw call, in milliseconds
+BUDGETS_MS = {
+    'draw_skeleton_arm': 2.0,
+    'draw_neural_network': 2.0,
+    'draw_progress_bar': 1.0,
+    'draw_crosshair': 1.0,
+    'draw_face_ar_overlay': 2.0,
+    'draw_scanning_effect': 2.0,
+    'draw_circuit_overlay': 2.0,
+    'draw_system_info': 8.0,
+    'draw_complete_hud': 25.0
+}
+
+
+class Landmark:
+    """Minimal stand-in for a MediaPipe normalized landmark"""
+    def __init__(self, x, y, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class LandmarkList:
+    """Minimal stand-in for a MediaPipe NormalizedLandmarkList"""
+    def __init__(self, points):
+        self.landmark = [Landmark(*p) for p in points]
+
+
+def synthetic_face(seed=0):
+    """478 refined face-mesh points: an elliptical silhouette with features inside"""
+    from face_geometry import FACE_OVAL
+
+    rng = np.random.RandomState(seed)
+    points = np.column_stack([
+        rng.uniform(0.44, 0.56, 478),
+        rng.uniform(0.30, 0.52, 478),
+        rng.uniform(-0.03, 0.03, 478)
+    ])
+    angles = np.linspace(0, 2 * np.pi, len(FACE_OVAL), endpoint=False)
+    points[FACE_OVAL, 0] = 0.5 + 0.09 * np.sin(angles)
+    points[FACE_OVAL, 1] = 0.41 - 0.16 * np.cos(angles)
+    return LandmarkList(points)
+
+
+def synthetic_hand(center_x, center_y, spread=0.08):
+    """21 hand points fanned upwards from the wrist (an open palm)"""
+    points = [(center_x, center_y + spread, 0.0)]
+    for finger in range(5):
+        angle = np.radians(-60 + finger * 30)
+        for joint in range(1, 5):
+            reach = spread * joint / 4
+            points.append((center_x + reach * np.sin(angle), center_y + spread - reach * 1.6 * np.cos(angle), 0.0))
+    return LandmarkList(points)
+
+
+def synthetic_pose():
+    """33 pose points with a raised left arm"""
+    points = [(0.5, 0.4, 0.0)] * 33
+    points[11] = (0.62, 0.62, 0.0)  # left shoulder
+    points[13] = (0.72, 0.50, 0.0)  # left elbow
+    points[15] = (0.76, 0.36, 0.0)  # left wrist
+    points[17] = (0.78, 0.32, 0.0)  # left pinky
+    points[19] = (0.77, 0.31, 0.0)  # left index
+    points[21] = (0.74, 0.32, 0.0)  # left thumb
+    return LandmarkList(points)
+
+
+def base_frame():
+    """Deterministic background so blending paths are exercised"""
+    height, width = FRAME_SIZE
+    gradient = np.linspace(0, 120, width, dtype=np.float32)
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:] = gradient[None, :, None].astype(np.uint8)
+    frame[:, :, 1] //= 2
+    return frame
+
+
+def make_hud():
+    """CyberneticHUD with a frozen animation clock"""
+    return CyberneticHUD(clock=lambda: FROZEN_TIME)
+
+
+def scenarios():
+    """Named draw_complete_hud argument sets covering every HUD element"""
+    face = [synthetic_face()]
+    hands = [synthetic_hand(0.3, 0.6), synthetic_hand(0.7, 0.6)]
+    pose = synthetic_pose()
+
+    common = dict(cyborg_evolution=58.2, borg_level=8.2)
+    return {
+        'idle': dict(face_landmarks=None, hand_landmarks=None, pose_landmarks=None,
+                     gesture="none", face_detected=False, scanning_active=False, **common),
+        'face': dict(face_landmarks=face, hand_landmarks=None, pose_landmarks=pose,
+                     gesture="none", face_detected=True, scanning_active=False, **common),
+        'scanning': dict(face_landmarks=face, hand_landmarks=hands[:1], pose_landmarks=pose,
+                         gesture="pinch", face_detected=True, scanning_active=True,
+                         hand_gestures=["pinch"], **common),
+        'open_palm': dict(face_landmarks=face, hand_landmarks=hands, pose_landmarks=pose,
+                          gesture="open_palm", face_detected=True, scanning_active=False,
+                          hand_gestures=["open_palm", "fist"], **common)
+    }
+
+
+def render(kwargs):
+    """Render one scenario on a fresh HUD"""
+    return make_hud().draw_complete_hud(base_frame(), **kwargs)
+
+
+def compare_frame(frame, golden, tolerance, max_bad_fraction):
+    """Return (passed, bad_fraction, max_diff) for a frame against its golden image"""
+    if golden.shape != frame.shape:
+        return False, 1.0, 255
+    diff = cv2.absdiff(frame, golden).max(axis=2)
+    bad_fraction = float(np.count_nonzero(diff > tolerance)) / diff.size
+    return bad_fraction <= max_bad_fraction, bad_fraction, int(diff.max())
+
+
+def check_golden(golden_dir, update, tolerance, max_bad_fraction):
+    """Render every scenario and compare (or record) golden images"""
+    failures = 0
+    os.makedirs(golden_dir, exist_ok=True)
+
+    for name, kwargs in scenarios().items():
+        frame = render(kwargs)
+        path = os.path.join(golden_dir, f"{name}.png")
+
+        if update:
+            cv2.imwrite(path, frame)
+            print(f"📝 {name}: recorded {path}")
+            continue
+
+        golden = cv2.imread(path)
+        if golden is None:
+            print(f"❌ {name}: missing golden image {path} (run with --update)")
+            failures += 1
+            continue
+
+        passed, bad_fraction, max_diff = compare_frame(frame, golden, tolerance, max_bad_fraction)
+        if passed:
+            print(f"✅ {name}: {bad_fraction:.4%} pixels over tolerance (max diff {max_diff})")
+        else:
+            failures += 1
+            cv2.imwrite(os.path.join(golden_dir, f"{name}.actual.png"), frame)
+            cv2.imwrite(os.path.join(golden_dir, f"{name}.diff.png"), cv2.absdiff(frame, golden))
+            print(f"❌ {name}: {bad_fraction:.4%} pixels over tolerance (max diff {max_diff}), "
+                  f"wrote {name}.actual.png / {name}.diff.png")
+
+    return failures
+
+
+def time_call(func, iterations):
+    """Median wall-clock time of func() in milliseconds"""
+    func()  # warm-up (allocations, caches)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def check_budgets(iterations, budget_scale):
+    """Time each draw method on the synthetic scene against BUDGETS_MS"""
+    hud = make_hud()
+    frame = base_frame()
+    args = scenarios()['open_palm']
+    face = args['face_landmarks']
+    hands = args['hand_landmarks']
+    height, width = FRAME_SIZE
+
+    def uncached(draw):
+        """Time the face geometry computation too, not just its per-frame cache hit"""
+        def call():
+            hud.face_geometry.invalidate()
+            draw(frame, face)
+        return call
+
+    calls = {
+        'draw_skeleton_arm': lambda: hud.draw_skeleton_arm(frame, args['pose_landmarks']),
+        'draw_neural_network': lambda: hud.draw_neural_network(frame, x_offset=50, y_offset=350),
+        'draw_progress_bar': lambda: hud.draw_progress_bar(frame, width - 350, height - 150, 300, 20,
+                                                           58.2, "cyborg evolution", hud.orange),
+        'draw_crosshair': lambda: hud.draw_crosshair(frame, (width // 2, height // 2), 30),
+        'draw_face_ar_overlay': uncached(hud.draw_face_ar_overlay),
+        'draw_scanning_effect': uncached(hud.draw_scanning_effect),
+        'draw_circuit_overlay': lambda: hud.draw_circuit_overlay(frame, hands),
+        'draw_system_info': lambda: hud.draw_system_info(frame),
+        'draw_complete_hud': lambda: hud.draw_complete_hud(frame, **args)
+    }
+
+    failures = 0
+    for name, func in calls.items():
+        elapsed = time_call(func, iterations)
+        budget = BUDGETS_MS[name] * budget_scale
+        if elapsed <= budget:
+            print(f"✅ {name}: {elapsed:.3f}ms (budget {budget:.1f}ms)")
+        else:
+            failures += 1
+            print(f"❌ {name}: {elapsed:.3f}ms exceeds budget {budget:.1f}ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden-frame and performance checks for CyberneticHUD")
+    parser.add_argument("--update", action="store_true", help="Record new golden images instead of comparing")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR, help="Directory holding golden PNGs")
+    parser.add_argument("--tolerance", type=int, default=8, help="Per-pixel channel difference allowed")
+    parser.add_argument("--max-bad-fraction", type=float, default=0.001,
+                        help="Fraction of pixels allowed over tolerance")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed iterations per draw method")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every budget (slow CI boxes)")
+    parser.add_argument("--skip-perf", action="store_true", help="Only run the golden-frame comparison")
+    args = parser.parse_args()
+
+    print("🖼️  Golden frames")
+    failures = check_golden(args.golden_dir, args.update, args.tolerance, args.max_bad_fraction)
+
+    if not args.skip_perf and not args.update:
+        print("⏱️  Draw budgets")
+        failures += check_budgets(args.iterations, args.budget_scale)
+
+    if failures:
+        print(f"💥 {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
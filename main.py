@@ -9,142 +9,394 @@ face, hands, and body in real-time using MediaPipe and OpenCV.
 Please give credit when using this code!
 """
 
+import os
+import threading
 import cv2
 import mediapipe as mp
 import numpy as np
 import time
-from hud import CyberneticHUD
+from hud import COLOR_NAMES, CyberneticHUD
 from gestures import GestureRecognizer
-from utils import FPSCounter
+from gesture_model import GestureClassifier
+from hand_tracker import HandRegistry
+from capture import CameraSource
+from telemetry import HudMetrics, JsonSnapshotWriter, MetricsServer
+from utils import ConfigManager, FPSCounter, MotionGate, PerformanceMonitor
+
+# Divisible by every cadence from 1 to 16, so wrapping never skews a model's schedule
+FRAME_INDEX_WRAP = 720720
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
 
 class CyborgARSystem:
-    def __init__(self):
+    def __init__(self, config=None):
         # Initialize MediaPipe
         self.mp_face_mesh = mp.solutions.face_mesh
         self.mp_hands = mp.solutions.hands
         self.mp_pose = mp.solutions.pose
         self.mp_drawing = mp.solutions.drawing_utils
         
-        # Initialize face mesh and hands
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        
-        # Initialize pose tracking for skeleton arm
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            enable_segmentation=False,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        # Configuration (file-backed, hot-reloaded while run() is active)
+        self.config = config if config is not None else ConfigManager(DEFAULT_CONFIG_PATH)
+        self.models = {}
+        self._pending_settings = None
+        self._pending_lock = threading.Lock()
+        self.frame_index = 0
         
         # Initialize components
         self.hud = CyberneticHUD()
+        self.face_geometry = self.hud.face_geometry
         self.gesture_recognizer = GestureRecognizer()
+        self.hand_registry = HandRegistry()
         self.fps_counter = FPSCounter()
+        self.performance_monitor = PerformanceMonitor()
+        self.metrics = HudMetrics()
         
         # System state
+        self.reset_state()
+        
+        # Initialize face mesh, hands and pose from the config
+        self.apply_settings(self.prepare_settings(self.config.snapshot()))
+        
+    def reset_state(self):
+        """Start gesture-driven state and hand tracking IDs over"""
         self.cyborg_evolution = 58.2  # Starting percentage like in reference
         self.borg_level = 8.2
         self.current_gesture = "none"
         self.face_detected = False
         self.scanning_active = False
         self.evolution_progress = 0
+        self.hand_registry = HandRegistry(max_hands=self.hand_registry.max_hands)
+    
+    def reset_tracking(self):
+        """Rebuild the MediaPipe graphs so tracking carries no history from earlier frames"""
+        old_models = self.models
+        self.models = self.build_models(self.settings)
+        self.results = {name: None for name in self.models}
+        self.frame_index = 0
+        self.face_geometry.invalidate()
+        self.close_models(old_models)
+    
+    def build_models(self, settings):
+        """Construct the MediaPipe graphs described by a config snapshot"""
+        models = {'face': None, 'hands': None, 'pose': None}
         
-    def process_frame(self, frame):
-        """Process each frame for face, hand, and pose detection"""
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if settings['models']['face']['enabled']:
+            models['face'] = self.mp_face_mesh.FaceMesh(
+                max_num_faces=settings['max_faces'],
+                refine_landmarks=True,  # face_geometry reads the iris landmarks
+                min_detection_confidence=settings['detection_confidence'],
+                min_tracking_confidence=settings['tracking_confidence']
+            )
         
-        # Process face mesh
-        face_results = self.face_mesh.process(frame_rgb)
+        if settings['models']['hands']['enabled']:
+            models['hands'] = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=settings['max_hands'],
+                min_detection_confidence=settings['detection_confidence'],
+                min_tracking_confidence=settings['tracking_confidence']
+            )
         
-        # Process hands
-        hand_results = self.hands.process(frame_rgb)
+        # Pose tracking for skeleton arm
+        if settings['models']['pose']['enabled']:
+            models['pose'] = self.mp_pose.Pose(
+                static_image_mode=False,
+                model_complexity=settings['model_complexity'],
+                enable_segmentation=False,
+                min_detection_confidence=settings['detection_confidence'],
+                min_tracking_confidence=settings['tracking_confidence']
+            )
         
-        # Process pose for skeleton arm tracking
-        pose_results = self.pose.process(frame_rgb)
+        return models
+    
+    def prepare_settings(self, settings):
+        """Validate a config snapshot and build everything it needs; raises if anything is invalid.
+        
+        Runs on the config watcher thread for reloads, so the frame loop only
+        ever swaps in fully built objects.
+        """
+        try:
+            inference_scale = float(settings['inference_scale'])
+            cadence = {name: int(settings['models'][name]['every_n_frames']) for name in ('face', 'hands', 'pose')}
+            max_hands = int(settings['max_hands'])
+            max_faces = int(settings['max_faces'])
+            model_complexity = int(settings['model_complexity'])
+            confidences = [float(settings[key]) for key in ('detection_confidence', 'tracking_confidence')]
+            animation_speed = float(settings['animation_speed'])
+            colors = {name: tuple(int(c) for c in color) for name, color in settings['colors'].items()}
+            gate = settings['motion_gate']
+            motion_gate = MotionGate(tuple(int(v) for v in gate['thumb_size']), int(gate['pixel_threshold']),
+                                     float(gate['changed_fraction']), int(gate['refresh_interval'])) \
+                if gate['enabled'] else None
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"invalid config value: {e!r}") from e
         
-        # Update face detection status
-        self.face_detected = face_results.multi_face_landmarks is not None
+        if not 0.0 < inference_scale <= 1.0:
+            raise ValueError(f"inference_scale must be in (0, 1], got {inference_scale}")
+        if min(cadence.values()) < 1:
+            raise ValueError("models.*.every_n_frames must be at least 1")
+        if max_hands < 1 or max_faces < 1:
+            raise ValueError("max_hands and max_faces must be at least 1")
+        if model_complexity not in (0, 1, 2):
+            raise ValueError(f"model_complexity must be 0, 1 or 2, got {model_complexity}")
+        if not all(0.0 <= value <= 1.0 for value in confidences):
+            raise ValueError("detection_confidence and tracking_confidence must be in [0, 1]")
+        unknown = sorted(set(colors) - set(COLOR_NAMES))
+        if unknown:
+            raise ValueError(f"unknown colors {unknown}; expected some of {list(COLOR_NAMES)}")
+        if any(len(color) != 3 for color in colors.values()):
+            raise ValueError("colors must be [b, g, r] triples")
         
-        # Process gestures
-        if hand_results.multi_hand_landmarks:
-            for hand_landmarks in hand_results.multi_hand_landmarks:
-                self.current_gesture = self.gesture_recognizer.recognize_gesture(hand_landmarks)
+        # Reuse the loaded classifier when the weights path is unchanged
+        model_path = self.config.resolve_path(settings['gesture_model'])
+        if model_path == self.gesture_recognizer.model_path:
+            classifier = self.gesture_recognizer.classifier
         else:
-            self.current_gesture = "none"
+            classifier = GestureClassifier.load(model_path) if model_path else None
+        
+        settings = dict(settings, inference_scale=inference_scale, max_hands=max_hands, max_faces=max_faces,
+                        model_complexity=model_complexity, detection_confidence=confidences[0],
+                        tracking_confidence=confidences[1], animation_speed=animation_speed, colors=colors)
+        prepared = {
+            'settings': settings,
+            'cadence': cadence,
+            'motion_gate': motion_gate,
+            'gesture_model': (model_path, classifier),
+            'hand_registry': HandRegistry(max_hands=max_hands)
+        }
+        # Build the graphs last so a failure above cannot leak them
+        prepared['models'] = self.build_models(settings)
+        return prepared
+    
+    def apply_settings(self, prepared):
+        """Install settings built by prepare_settings (reference assignments only)"""
+        settings = prepared['settings']
+        self.settings = settings
+        self.models = prepared['models']
+        self.results = {name: None for name in self.models}
+        self.inference_scale = settings['inference_scale']
+        self.model_cadence = prepared['cadence']
+        self.show_fps = settings['show_fps']
+        self.gesture_recognizer.set_classifier(*prepared['gesture_model'])
+        self.motion_gate = prepared['motion_gate']
+        self.hud.apply_config(settings)
+        
+        if self.hand_registry.max_hands != settings['max_hands']:
+            self.hand_registry = prepared['hand_registry']
+    
+    def on_config_change(self, settings):
+        """Validate a new config and build its models (watcher thread), then stage them for swapping.
+        
+        Errors propagate to the watcher, which logs them; the running settings stay in place.
+        """
+        prepared = self.prepare_settings(settings)
+        with self._pending_lock:
+            stale = self._pending_settings
+            self._pending_settings = prepared
+        
+        # A newer reload arrived before the frame loop picked up the previous one
+        if stale is not None:
+            self.close_models(stale['models'])
+        print(f"⚙️  Config v{self.config.version} loaded, swapping models on next frame")
+    
+    def swap_pending_models(self):
+        """Swap in staged models and settings between frames"""
+        if self._pending_settings is None:
+            return
+        with self._pending_lock:
+            prepared = self._pending_settings
+            self._pending_settings = None
+        
+        old_models = self.models
+        self.apply_settings(prepared)
+        self.close_models(old_models)
+    
+    def close_models(self, models):
+        """Release MediaPipe graphs"""
+        for model in models.values():
+            if model is not None:
+                model.close()
+    
+    def run_models(self, frame):
+        """Run each enabled model on its frame cadence, reusing the last result in between"""
+        index = self.frame_index
+        self.frame_index = (index + 1) % FRAME_INDEX_WRAP
+        
+        # Static scene: keep the previous results (the HUD still animates)
+        if self.motion_gate is not None and self.motion_gate.is_static(frame):
+            if all(self.results[name] is not None for name, model in self.models.items() if model is not None):
+                self.metrics.skipped_frames.inc()
+                return
+        
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if self.inference_scale != 1.0:
+            # Landmarks are normalized, so they map straight back onto the full frame
+            frame_rgb = cv2.resize(frame_rgb, None, fx=self.inference_scale, fy=self.inference_scale,
+                                   interpolation=cv2.INTER_AREA)
+        
+        for name, model in self.models.items():
+            if model is None:
+                self.results[name] = None
+            elif self.results[name] is None or index % self.model_cadence[name] == 0:
+                start = time.perf_counter()
+                self.results[name] = model.process(frame_rgb)
+                self.metrics.inference_seconds[name].observe(time.perf_counter() - start)
+        
+    def process_frame(self, frame):
+        """Process each frame for face, hand, and pose detection"""
+        frame_start = time.perf_counter()
+        
+        # Pick up models rebuilt by a config reload
+        self.swap_pending_models()
+        
+        # Process face mesh, hands and pose (each on its own cadence)
+        self.run_models(frame)
+        face_landmarks = getattr(self.results['face'], 'multi_face_landmarks', None)
+        hand_landmarks = getattr(self.results['hands'], 'multi_hand_landmarks', None)
+        pose_landmarks = getattr(self.results['pose'], 'pose_landmarks', None)
+        
+        # Update face detection status and the shared face geometry
+        self.face_detected = face_landmarks is not None
+        self.face_geometry.update(
+            face_landmarks[0] if self.face_detected else None,
+            frame.shape[1], frame.shape[0]
+        )
+        
+        # Process gestures per hand and match hands to tracked IDs
+        hands = hand_landmarks or []
+        gestures = self.gesture_recognizer.recognize_gestures(hands)
+        centers = [self.gesture_recognizer.get_hand_center(hand) for hand in hands]
+        self.hand_registry.update(centers, gestures)
+        hand_gestures = self.hand_registry.detection_gestures()
         
         # Update system state based on gestures
+        previous_gesture = self.current_gesture
         self.update_system_state()
         
+        # Detection and gesture telemetry
+        metrics = self.metrics
+        metrics.frames.inc()
+        if self.face_detected:
+            metrics.face_frames.inc()
+        if hands:
+            metrics.hands_seen.inc(len(hands))
+        if pose_landmarks is not None:
+            metrics.pose_frames.inc()
+        if self.current_gesture != previous_gesture and self.current_gesture != "none":
+            metrics.count_gesture(self.current_gesture)
+        
         # Draw HUD overlays
         frame = self.hud.draw_complete_hud(
             frame, 
-            face_results.multi_face_landmarks if face_results.multi_face_landmarks else None,
-            hand_results.multi_hand_landmarks if hand_results.multi_hand_landmarks else None,
-            pose_results.pose_landmarks if pose_results.pose_landmarks else None,
+            face_landmarks if face_landmarks else None,
+            hand_landmarks if hand_landmarks else None,
+            pose_landmarks if pose_landmarks else None,
             self.cyborg_evolution,
             self.borg_level,
             self.current_gesture,
             self.face_detected,
-            self.scanning_active
+            self.scanning_active,
+            hand_gestures
         )
         
         # Draw FPS
-        fps = self.fps_counter.get_fps()
-        cv2.putText(frame, f"FPS: {fps:.1f}", (frame.shape[1] - 120, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        if self.show_fps:
+            fps = self.fps_counter.get_fps()
+            cv2.putText(frame, f"FPS: {fps:.1f}", (frame.shape[1] - 120, 30), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+            
+            # Capture-to-display latency measured over recent frames
+            latency = self.performance_monitor.get_average_time("glass_to_glass")
+            if latency > 0:
+                cv2.putText(frame, f"LAT: {latency * 1000:.0f}ms", (frame.shape[1] - 120, 55), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
         
+        self.metrics.frame_seconds.observe(time.perf_counter() - frame_start)
         return frame
     
     def update_system_state(self):
-        """Update system state based on current gesture"""
-        if self.current_gesture == "open_palm":
+        """Update system state based on each tracked hand's gesture"""
+        registry = self.hand_registry
+        palm_seen = False
+        pinch_seen = False
+        
+        for slot in range(registry.max_hands):
+            if not registry.seen[slot]:
+                continue
+            gesture = registry.gesture(slot)
+            
+            if gesture == "open_palm":
+                palm_seen = True
+                
+            elif gesture == "fist":
+                # Each hand charges its own evolution progress
+                registry.evolution_progress[slot] = min(100, registry.evolution_progress[slot] + 2)
+                if registry.evolution_progress[slot] >= 100:
+                    self.cyborg_evolution = min(100.0, self.cyborg_evolution + 5)
+                    registry.evolution_progress[slot] = 0
+                    
+            elif gesture == "pinch":
+                pinch_seen = True
+        
+        if palm_seen:
             # Slowly increase evolution
             self.cyborg_evolution = min(100.0, self.cyborg_evolution + 0.1)
             self.borg_level = min(10.0, self.borg_level + 0.05)
-            
-        elif self.current_gesture == "fist":
-            # Activate evolution progress
-            self.evolution_progress = min(100, self.evolution_progress + 2)
-            if self.evolution_progress >= 100:
-                self.cyborg_evolution = min(100.0, self.cyborg_evolution + 5)
-                self.evolution_progress = 0
-                
-        elif self.current_gesture == "pinch":
-            # Activate scanning
-            self.scanning_active = True
+        
+        # Activate scanning while any hand pinches
+        self.scanning_active = pinch_seen
+        
+        primary = registry.primary_slot()
+        self.evolution_progress = float(registry.evolution_progress[primary]) if primary >= 0 else 0
+        
+        # Two-hand gestures take precedence in the gesture readout
+        if registry.two_hand_gesture != "none":
+            self.current_gesture = registry.two_hand_gesture
         else:
-            self.scanning_active = False
+            self.current_gesture = registry.gesture(primary) if primary >= 0 else "none"
+    
+    def start_telemetry(self):
+        """Start the metrics endpoint and/or JSON snapshot writer enabled in the config"""
+        telemetry = self.settings['telemetry']
+        exporters = []
+        
+        if telemetry['http_port']:
+            exporters.append(MetricsServer(self.metrics.registry, telemetry['http_host'],
+                                           telemetry['http_port']).start())
+            print(f"📈 Metrics: http://{telemetry['http_host']}:{telemetry['http_port']}/metrics")
+        
+        if telemetry['json_path']:
+            exporters.append(JsonSnapshotWriter(self.metrics.registry, telemetry['json_path'],
+                                                telemetry['json_interval']).start())
+            print(f"📈 Metrics snapshots: {telemetry['json_path']} every {telemetry['json_interval']}s")
+        
+        return exporters
     
     def run(self):
         """Main application loop"""
-        cap = cv2.VideoCapture(0)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+        camera = CameraSource(0, width=1280, height=720, fps=30).open()
+        self.config.watch(self.on_config_change)
+        exporters = self.start_telemetry()
         
         print("🤖 CYBORG AR SYSTEM INITIALIZING...")
+        print("📷 Camera: {width}x{height} {format} @ {fps:.0f} FPS (buffer {buffer_size})".format(**camera.negotiated))
         print("👋 Show your hand gestures:")
         print("   • Open Palm → Circuit overlays")
         print("   • Fist → Evolution progress") 
         print("   • Pinch → Face scanning")
         print("   • Press 'q' to quit")
         
+        dropped_frames = 0
         while True:
-            ret, frame = cap.read()
+            ret, frame, capture_time = camera.read()
             if not ret:
-                break
+                # A timeout is a stall or slow start; only quit once the grab thread has stopped
+                if not camera.running:
+                    break
+                # Keep the window responsive (and 'q' working) while waiting for frames
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
             
             # Flip frame horizontally for mirror effect
             frame = cv2.flip(frame, 1)
@@ -159,11 +411,22 @@ class CyborgARSystem:
             cv2.imshow('Cybernetic AR HUD', frame)
             
             # Check for quit
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            key = cv2.waitKey(1) & 0xFF
+            latency = time.monotonic() - capture_time
+            self.performance_monitor.record("glass_to_glass", latency)
+            self.metrics.glass_to_glass_seconds.observe(latency)
+            # The camera count is cumulative; add only what was dropped since the last frame
+            dropped = camera.dropped_frames
+            self.metrics.dropped_frames.inc(dropped - dropped_frames)
+            dropped_frames = dropped
+            if key == ord('q'):
                 break
         
         # Cleanup
-        cap.release()
+        for exporter in exporters:
+            exporter.stop()
+        self.config.stop()
+        camera.release()
         cv2.destroyAllWindows()
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+"""
+Soak test for long-running HUD deployments.
+
+Loops a recording through CyborgARSystem.process_frame for hours and samples
+process RSS, the number of live Python objects and tracemalloc-traced memory
+at fixed intervals. Fails (exit code 1) when growth over the post-warm-up
+baseline passes a threshold, printing the allocation sites that grew most, or
+when the run ends before any sample after the baseline was taken.
+
+Usage:
+    python soak.py recording.mp4 --hours 6 --interval 300
+    python soak.py recording.mp4 --frames 5000 --interval 30   # quick check
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import cv2
+
+
+def read_rss_bytes():
+    """Current resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        # Peak RSS is the best stdlib fallback (KiB on Linux, bytes on macOS)
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class LoopedVideo:
+    """Endless frame source that rewinds the recording at its end"""
+    def __init__(self, path):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video: {path}")
+        self.loops = 0
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.loops += 1
+            ret, frame = self.cap.read()
+            if not ret:
+                raise IOError(f"No frames in {self.path}")
+        return frame
+
+    def release(self):
+        self.cap.release()
+
+
+class SoakMonitor:
+    """Interval sampler for memory growth; keeps a bounded sample history"""
+    def __init__(self, trace_allocations=True, history=512, top_sites=10):
+        self.trace_allocations = trace_allocations
+        self.samples = deque(maxlen=history)
+        self.top_sites = top_sites
+        self.baseline = None
+        self._baseline_snapshot = None
+        self._previous = None
+
+        if trace_allocations:
+            tracemalloc.start(1)
+
+    def sample(self, frames):
+        """Record one sample: RSS, live objects, traced memory, its growth rate and interval peak"""
+        gc.collect()
+        now = time.monotonic()
+        traced, peak = tracemalloc.get_traced_memory() if self.trace_allocations else (0, 0)
+        sample = {
+            'time': now,
+            'frames': frames,
+            'rss': read_rss_bytes(),
+            'objects': len(gc.get_objects()),
+            'traced': traced,
+            # Highest traced memory since the previous sample: transient per-frame churn
+            # shows up here even when allocations and frees balance out
+            'peak': peak
+        }
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+
+        # Net traced bytes per second since the last sample (not an allocation rate)
+        previous = self._previous
+        if previous is not None and now > previous['time']:
+            sample['growth_rate'] = (sample['traced'] - previous['traced']) / (now - previous['time'])
+        else:
+            sample['growth_rate'] = 0.0
+
+        self.samples.append(sample)
+        self._previous = sample
+        return sample
+
+    def set_baseline(self, sample):
+        """Measure growth relative to this sample from now on"""
+        self.baseline = sample
+        if self.trace_allocations:
+            self._baseline_snapshot = tracemalloc.take_snapshot()
+
+    def growth(self, sample):
+        """(rss_bytes, objects, traced_bytes) growth over the baseline"""
+        base = self.baseline
+        return (sample['rss'] - base['rss'],
+                sample['objects'] - base['objects'],
+                sample['traced'] - base['traced'])
+
+    def top_growth(self):
+        """Allocation sites that grew most since the baseline"""
+        if not self.trace_allocations or self._baseline_snapshot is None:
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>")
+        ))
+        stats = snapshot.compare_to(self._baseline_snapshot, "lineno")
+        return [stat for stat in stats if stat.size_diff > 0][:self.top_sites]
+
+
+def run_soak(video_path, duration=None, max_frames=None, interval=300.0, warmup=60.0,
+             max_rss_growth_mb=64.0, max_object_growth=20000, max_traced_growth_mb=32.0,
+             trace_allocations=True):
+    """Run the soak loop; returns True if memory stayed within the thresholds"""
+    from main import CyborgARSystem
+
+    system = CyborgARSystem()
+    video = LoopedVideo(video_path)
+    monitor = SoakMonitor(trace_allocations=trace_allocations)
+
+    start = time.monotonic()
+    next_sample = start + warmup
+    frames = 0
+    measured = 0  # samples compared against the baseline
+    passed = True
+
+    print(f"🧪 Soak test on {video_path}: warm-up {warmup:.0f}s, sampling every {interval:.0f}s")
+    try:
+        while True:
+            system.process_frame(video.read())
+            system.fps_counter.update()
+            frames += 1
+
+            now = time.monotonic()
+            done = (duration is not None and now - start >= duration) or \
+                   (max_frames is not None and frames >= max_frames)
+
+            if now < next_sample and not done:
+                continue
+            next_sample = now + interval
+
+            sample = monitor.sample(frames)
+            if monitor.baseline is None:
+                monitor.set_baseline(sample)
+                print(f"📏 Baseline after {frames} frames: RSS {sample['rss'] / 2**20:.1f}MB, "
+                      f"{sample['objects']} objects, traced {sample['traced'] / 2**20:.1f}MB")
+            else:
+                measured += 1
+                rss, objects, traced = monitor.growth(sample)
+                print(f"⏱️  {(now - start) / 60:7.1f}min {frames:>9} frames (loop {video.loops}) | "
+                      f"RSS {rss / 2**20:+7.1f}MB | objects {objects:+7d} | traced {traced / 2**20:+6.1f}MB | "
+                      f"net {sample['growth_rate'] / 1024:+7.1f}KB/s | peak {sample['peak'] / 2**20:6.1f}MB | "
+                      f"{system.fps_counter.get_fps():5.1f} FPS")
+
+                if rss > max_rss_growth_mb * 2**20 or objects > max_object_growth or \
+                        traced > max_traced_growth_mb * 2**20:
+                    passed = False
+                    print("❌ Memory growth exceeded thresholds")
+                    break
+
+            if done:
+                break
+    finally:
+        video.release()
+
+    if passed and not measured:
+        # A baseline alone proves nothing; the run was too short to compare against it
+        passed = False
+        print("⚠️  Run ended before a sample after the baseline; nothing was measured "
+              "(run longer than --warmup plus one --interval)")
+    elif monitor.trace_allocations and not passed:
+        print("🔎 Top allocation growth since baseline:")
+        for stat in monitor.top_growth():
+            print(f"   {stat}")
+
+    print("✅ Memory stable" if passed else "💥 Soak test failed")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-running memory soak test for the HUD pipeline")
+    parser.add_argument("video", help="Recording to loop through process_frame")
+    parser.add_argument("--hours", type=float, default=None, help="Run duration in hours")
+    parser.add_argument("--frames", type=int, default=None, help="Stop after this many frames")
+    parser.add_argument("--interval", type=float, default=300.0, help="Seconds between samples")
+    parser.add_argument("--warmup", type=float, default=60.0, help="Seconds before the baseline sample")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=64.0)
+    parser.add_argument("--max-object-growth", type=int, default=20000)
+    parser.add_argument("--max-traced-growth-mb", type=float, default=32.0)
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip tracemalloc (lower overhead)")
+    args = parser.parse_args()
+
+    if args.hours is None and args.frames is None:
+        parser.error("pass --hours and/or --frames")
+
+    passed = run_soak(
+        args.video,
+        duration=args.hours * 3600 if args.hours is not None else None,
+        max_frames=args.frames,
+        interval=args.interval,
+        warmup=args.warmup,
+        max_rss_growth_mb=args.max_rss_growth_mb,
+        max_object_growth=args.max_object_growth,
+        max_traced_growth_mb=args.max_traced_growth_mb,
+        trace_allocations=not args.no_tracemalloc
+    )
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Default latency buckets in seconds (1ms .. 1s)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.033, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0)
+
+
+class Counter:
+    """Monotonic counter; updated only from the frame thread, so no lock is needed"""
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Gauge:
+    """Last-value metric"""
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() only bumps preallocated slots"""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Named metrics with optional labels, exported as Prometheus text or JSON.
+
+    Metrics are created up front; the hot path only calls inc/set/observe on
+    objects it already holds. Exporters read values from another thread without
+    locking, which can at worst show a sample that is one update behind.
+    """
+    def __init__(self, prefix="hud"):
+        self.prefix = prefix
+        self._metrics = {}  # name -> (kind, help, {label_value: metric}, label_name, factory)
+
+    def _register(self, kind, factory, name, help_text, label=None, label_values=()):
+        full_name = f"{self.prefix}_{name}"
+        if label is None:
+            series = {None: factory()}
+        else:
+            series = {value: factory() for value in label_values}
+        self._metrics[full_name] = (kind, help_text, series, label, factory)
+        return series[None] if label is None else series
+
+    def counter(self, name, help_text, label=None, label_values=()):
+        return self._register("counter", Counter, name, help_text, label, label_values)
+
+    def gauge(self, name, help_text, label=None, label_values=()):
+        return self._register("gauge", Gauge, name, help_text, label, label_values)
+
+    def histogram(self, name, help_text, label=None, label_values=(), buckets=LATENCY_BUCKETS):
+        return self._register("histogram", lambda: Histogram(buckets), name, help_text, label, label_values)
+
+    def labeled(self, series, name, label_value):
+        """Get (or lazily add) the series for a label value not known up front"""
+        metric = series.get(label_value)
+        if metric is None:
+            factory = self._metrics[f"{self.prefix}_{name}"][4]
+            metric = series.setdefault(label_value, factory())
+        return metric
+
+    def render_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for name, (kind, help_text, series, label, _) in list(self._metrics.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for label_value, metric in list(series.items()):
+                tag = f'{label}="{label_value}"' if label is not None else ""
+                if kind == "histogram":
+                    cumulative = 0
+                    counts = list(metric.counts)
+                    for bound, count in zip(metric.buckets + (float("inf"),), counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        tags = f"{tag}," if tag else ""
+                        lines.append(f'{name}_bucket{{{tags}le="{le}"}} {cumulative}')
+                    suffix = f"{{{tag}}}" if tag else ""
+                    lines.append(f"{name}_sum{suffix} {metric.sum}")
+                    lines.append(f"{name}_count{suffix} {metric.count}")
+                else:
+                    suffix = f"{{{tag}}}" if tag else ""
+                    lines.append(f"{name}{suffix} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Plain-dict view of every metric for JSON export"""
+        data = {'timestamp': time.time()}
+        for name, (kind, _, series, label, _) in list(self._metrics.items()):
+            values = {}
+            for label_value, metric in list(series.items()):
+                if kind == "histogram":
+                    value = {
+                        'buckets': dict(zip([str(b) for b in metric.buckets] + ["+Inf"], list(metric.counts))),
+                        'sum': metric.sum,
+                        'count': metric.count
+                    }
+                else:
+                    value = metric.value
+                values[str(label_value) if label is not None else "value"] = value
+            data[name] = values if label is not None else values["value"]
+        return data
+
+
+class MetricsServer:
+    """Serve /metrics in Prometheus text format on a background thread"""
+    def __init__(self, registry, host="127.0.0.1", port=9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep scrapes out of the console
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class JsonSnapshotWriter:
+    """Periodically write a JSON snapshot of the registry to a file"""
+    def __init__(self, registry, path, interval=10.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="JsonSnapshotWriter", daemon=True)
+        self._thread.start()
+        return self
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        """Write one snapshot atomically (temp file + rename)"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.registry.snapshot(), f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.write()
+
+
+class HudMetrics:
+    """The metric set recorded by CyborgARSystem"""
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+
+        self.frames = r.counter("frames_total", "Frames processed")
+        self.frame_seconds = r.histogram("frame_seconds", "process_frame wall time")
+        self.glass_to_glass_seconds = r.histogram("glass_to_glass_seconds", "Capture to display latency")
+        self.inference_seconds = r.histogram("inference_seconds", "Model inference time",
+                                             label="model", label_values=("face", "hands", "pose"))
+        self.face_frames = r.counter("face_detected_frames_total", "Frames with a face detected")
+        self.hands_seen = r.counter("hands_detected_total", "Hands detected, summed over frames")
+        self.pose_frames = r.counter("pose_detected_frames_total", "Frames with a pose detected")
+        self.gestures = r.counter("gestures_total", "Gesture activations", label="gesture",
+                                  label_values=("open_palm", "fist", "pinch", "unknown", "pinch_zoom", "spread"))
+        self.skipped_frames = r.counter("inference_skipped_frames_total",
+                                        "Frames that reused previous results because the scene was static")
+        self.dropped_frames = r.counter("camera_dropped_frames_total", "Camera frames overwritten before processing")
+
+    def count_gesture(self, gesture):
+        self.registry.labeled(self.gestures, "gestures_total", gesture).inc()
@@ -1,36 +1,60 @@
+import copy
+import json
+import os
+import threading
 import time
+from collections import deque
 import cv2
 import numpy as np
 
+class RollingMean:
+    """Mean of the last `size` samples with O(1) updates and fixed memory"""
+    def __init__(self, size=30):
+        self.samples = deque(maxlen=size)
+        self.total = 0.0
+    
+    def add(self, value):
+        """Add a sample, evicting the oldest once the window is full"""
+        if len(self.samples) == self.samples.maxlen:
+            self.total -= self.samples[0]
+        self.samples.append(value)
+        self.total += value
+    
+    def mean(self):
+        """Mean of the samples in the window (0.0 when empty)"""
+        if not self.samples:
+            return 0.0
+        return self.total / len(self.samples)
+    
+    def __len__(self):
+        return len(self.samples)
+
 class FPSCounter:
     def __init__(self, buffer_size=30):
         self.buffer_size = buffer_size
-        self.frame_times = []
+        self.frame_times = RollingMean(buffer_size)
         self.last_time = time.time()
     
     def update(self):
         """Update the FPS counter with current time"""
         current_time = time.time()
-        self.frame_times.append(current_time - self.last_time)
+        self.frame_times.add(current_time - self.last_time)
         self.last_time = current_time
-        
-        # Keep only recent frames
-        if len(self.frame_times) > self.buffer_size:
-            self.frame_times.pop(0)
     
     def get_fps(self):
         """Calculate and return current FPS"""
         if len(self.frame_times) < 2:
             return 0.0
         
-        avg_frame_time = sum(self.frame_times) / len(self.frame_times)
-        if avg_frame_time == 0:
+        avg_frame_time = self.frame_times.mean()
+        if avg_frame_time <= 0:
             return 0.0
         
         return 1.0 / avg_frame_time
 
 class PerformanceMonitor:
-    def __init__(self):
+    def __init__(self, buffer_size=30):
+        self.buffer_size = buffer_size
         self.process_times = {}
         self.start_times = {}
     
@@ -42,29 +66,32 @@ class PerformanceMonitor:
         """End timing a process and store the duration"""
         if process_name in self.start_times:
             duration = time.time() - self.start_times[process_name]
-            if process_name not in self.process_times:
-                self.process_times[process_name] = []
-            
-            self.process_times[process_name].append(duration)
-            
-            # Keep only recent measurements
-            if len(self.process_times[process_name]) > 30:
-                self.process_times[process_name].pop(0)
+            self.record(process_name, duration)
+    
+    def record(self, process_name, duration):
+        """Store an externally measured duration (seconds) for a process"""
+        times = self.process_times.get(process_name)
+        if times is None:
+            times = self.process_times[process_name] = RollingMean(self.buffer_size)
+        
+        # Only the most recent buffer_size measurements are kept
+        times.add(duration)
     
     def get_average_time(self, process_name):
         """Get average processing time for a process"""
-        if process_name not in self.process_times or not self.process_times[process_name]:
+        if process_name not in self.process_times:
             return 0.0
         
-        return sum(self.process_times[process_name]) / len(self.process_times[process_name])
+        return self.process_times[process_name].mean()
     
     def get_performance_info(self):
         """Get performance information for all tracked processes"""
         info = {}
         for process_name in self.process_times:
+            avg_time = self.get_average_time(process_name)
             info[process_name] = {
-                'avg_time': self.get_average_time(process_name),
-                'fps': 1.0 / self.get_average_time(process_name) if self.get_average_time(process_name) > 0 else 0
+                'avg_time': avg_time,
+                'fps': 1.0 / avg_time if avg_time > 0 else 0
             }
         return info
 
@@ -90,6 +117,15 @@ def calculate_angle(point1, point2, point3):
     
     return np.degrees(angle)
 
+def calculate_angles(points1, points2, points3):
+    """Vectorized calculate_angle: angles (degrees) at points2 for arrays of shape (..., 2)"""
+    v1 = points1 - points2
+    v2 = points3 - points2
+    
+    norms = np.linalg.norm(v1, axis=-1) * np.linalg.norm(v2, axis=-1)
+    cosine = np.einsum('...i,...i->...', v1, v2) / np.maximum(norms, 1e-9)
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
 def smooth_value(current_value, target_value, smoothing_factor=0.8):
     """Smooth transitions between values"""
     return current_value * smoothing_factor + target_value * (1 - smoothing_factor)
@@ -98,8 +134,15 @@ def interpolate_color(color1, color2, factor):
     """Interpolate between two colors"""
     return tuple(int(c1 * (1 - factor) + c2 * factor) for c1, c2 in zip(color1, color2))
 
-def create_glow_effect(frame, points, color, radius=20):
+def create_glow_effect(frame, points, color, radius=20, bloom=None):
     """Create a glowing effect around points"""
+    if bloom is not None and bloom.active:
+        # Emit into the bloom layer; the blur happens once per frame in BloomPass.apply
+        mask = bloom.emit()
+        for point in points:
+            cv2.circle(mask, point, radius // 2, color, -1)
+        return frame
+    
     overlay = frame.copy()
     
     for point in points:
@@ -115,7 +158,7 @@ def create_glow_effect(frame, points, color, radius=20):
 
 def draw_animated_text(frame, text, position, font=cv2.FONT_HERSHEY_SIMPLEX, 
                       font_scale=1, color=(255, 255, 255), thickness=2, 
-                      animation_type="pulse"):
+                      animation_type="pulse", bloom=None):
     """Draw animated text with various effects"""
     if animation_type == "pulse":
         pulse = abs(np.sin(time.time() * 3)) * 0.3 + 0.7
@@ -123,11 +166,15 @@ def draw_animated_text(frame, text, position, font=cv2.FONT_HERSHEY_SIMPLEX,
         cv2.putText(frame, text, position, font, current_scale, color, thickness)
     
     elif animation_type == "glow":
-        # Create glow effect
-        for offset in range(5, 0, -1):
-            alpha = (5 - offset) / 5 * 0.5
-            glow_color = tuple(int(c * alpha) for c in color)
-            cv2.putText(frame, text, position, font, font_scale, glow_color, thickness + offset)
+        if bloom is not None and bloom.active:
+            # One stroke into the bloom layer instead of stacked glow passes
+            cv2.putText(bloom.emit(), text, position, font, font_scale, color, thickness + 3)
+        else:
+            # Create glow effect
+            for offset in range(5, 0, -1):
+                alpha = (5 - offset) / 5 * 0.5
+                glow_color = tuple(int(c * alpha) for c in color)
+                cv2.putText(frame, text, position, font, font_scale, glow_color, thickness + offset)
         
         # Main text
         cv2.putText(frame, text, position, font, font_scale, color, thickness)
@@ -136,6 +183,104 @@ def draw_animated_text(frame, text, position, font=cv2.FONT_HERSHEY_SIMPLEX,
         # Default static text
         cv2.putText(frame, text, position, font, font_scale, color, thickness)
 
+class MotionGate:
+    """Cheap scene-change detector used to skip model inference on static frames.
+
+    Each frame is shrunk to a tiny grayscale thumbnail and compared with the
+    thumbnail of the last frame that went through inference, so slow drift
+    still adds up to a refresh. A refresh is also forced every refresh_interval
+    frames.
+    """
+    def __init__(self, thumb_size=(64, 36), pixel_threshold=12, changed_fraction=0.01, refresh_interval=15):
+        self.thumb_size = tuple(thumb_size)
+        self.pixel_threshold = pixel_threshold
+        self.changed_fraction = changed_fraction
+        self.refresh_interval = refresh_interval
+        
+        width, height = self.thumb_size
+        self._small = np.zeros((height, width, 3), dtype=np.uint8)
+        self._gray = np.zeros((height, width), dtype=np.uint8)
+        self._reference = np.zeros((height, width), dtype=np.uint8)
+        self._diff = np.zeros((height, width), dtype=np.uint8)
+        self._has_reference = False
+        self.frames_since_refresh = 0
+    
+    def is_static(self, frame):
+        """True when the frame matches the last refreshed frame closely enough to reuse its results"""
+        cv2.resize(frame, self.thumb_size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        
+        static = False
+        if self._has_reference and self.frames_since_refresh < self.refresh_interval:
+            cv2.absdiff(self._gray, self._reference, dst=self._diff)
+            cv2.threshold(self._diff, self.pixel_threshold, 255, cv2.THRESH_BINARY, dst=self._diff)
+            static = cv2.countNonZero(self._diff) <= self.changed_fraction * self._diff.size
+        
+        if static:
+            self.frames_since_refresh += 1
+        else:
+            self._reference[:] = self._gray
+            self._has_reference = True
+            self.frames_since_refresh = 0
+        return static
+    
+    def reset(self):
+        """Force the next frame through inference"""
+        self._has_reference = False
+
+class BloomPass:
+    """Fixed-cost bloom post-process for the HUD layer.
+
+    Glowing elements are drawn into an emissive mask during the frame. apply()
+    downsamples the mask, runs one separable Gaussian blur and adds the result
+    back onto the frame, so the cost does not depend on how many primitives glow.
+    Frames where nothing was emitted skip the clear and the blur entirely.
+    """
+    def __init__(self, downscale=4, sigma=3.0, intensity=0.8):
+        self.downscale = downscale
+        self.intensity = intensity
+        ksize = int(sigma * 6) | 1
+        self.kernel = cv2.getGaussianKernel(ksize, sigma)
+        
+        self.mask = None
+        self._small = None
+        self._upscaled = None
+        self.active = False  # between begin() and apply()
+        self.dirty = False   # mask holds emitted pixels
+    
+    def begin(self, frame):
+        """Start a pass with a cleared emissive mask matching the frame"""
+        if self.mask is None or self.mask.shape != frame.shape:
+            height, width = frame.shape[:2]
+            small_size = (max(1, height // self.downscale), max(1, width // self.downscale)) + frame.shape[2:]
+            self.mask = np.zeros_like(frame)
+            self._small = np.zeros(small_size, dtype=frame.dtype)
+            self._upscaled = np.zeros_like(frame)
+        elif self.dirty:
+            self.mask.fill(0)
+        self.dirty = False
+        self.active = True
+        return self.mask
+    
+    def emit(self):
+        """The mask to draw glowing pixels into; marks the pass as needing a blur"""
+        self.dirty = True
+        return self.mask
+    
+    def apply(self, frame):
+        """Blur the emissive mask at reduced resolution and add it onto the frame"""
+        self.active = False
+        if not self.dirty or self.mask.shape != frame.shape:
+            return frame
+        
+        height, width = frame.shape[:2]
+        small_h, small_w = self._small.shape[:2]
+        cv2.resize(self.mask, (small_w, small_h), dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.sepFilter2D(self._small, -1, self.kernel, self.kernel, dst=self._small)
+        cv2.resize(self._small, (width, height), dst=self._upscaled, interpolation=cv2.INTER_LINEAR)
+        cv2.addWeighted(frame, 1.0, self._upscaled, self.intensity, 0, dst=frame)
+        return frame
+
 def get_system_info():
     """Get basic system information"""
     return {
@@ -145,16 +290,65 @@ def get_system_info():
     }
 
 class ConfigManager:
-    """Manage application configuration"""
-    def __init__(self):
-        self.config = {
+    """Manage application configuration.
+
+    Values come from built-in defaults overlaid with an optional JSON file.
+    watch() polls the file and hands a fresh snapshot to a callback whenever it
+    changes, so settings can be tuned without restarting.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.version = 0
+        self._mtime = None
+        self._watch_thread = None
+        self._watching = False
+        self.config = self.defaults()
+        
+        if path is not None:
+            self.reload_if_changed()
+    
+    @staticmethod
+    def defaults():
+        """Built-in default configuration"""
+        return {
             'detection_confidence': 0.5,
             'tracking_confidence': 0.5,
             'max_faces': 1,
             'max_hands': 2,
+            'model_complexity': 1,
+            'inference_scale': 1.0,
+            'gesture_model': None,  # path to weights from gesture_model.py; None uses the rules
             'show_fps': True,
             'show_confidence': True,
             'animation_speed': 1.0,
+            'models': {
+                'face': {'enabled': True, 'every_n_frames': 1},
+                'hands': {'enabled': True, 'every_n_frames': 1},
+                'pose': {'enabled': True, 'every_n_frames': 1}
+            },
+            'hud': {
+                'skeleton_arm': True,
+                'neural_network': True,
+                'face_overlay': True,
+                'progress_bars': True,
+                'system_info': True,
+                'scanning_effect': True,
+                'circuit_overlay': True,
+                'bloom': True
+            },
+            'motion_gate': {
+                'enabled': False,  # for idle kiosks; reuses landmarks while the scene is static
+                'thumb_size': (64, 36),
+                'pixel_threshold': 12,
+                'changed_fraction': 0.01,
+                'refresh_interval': 15
+            },
+            'telemetry': {
+                'http_host': '127.0.0.1',
+                'http_port': 0,  # 0 disables the /metrics endpoint
+                'json_path': None,
+                'json_interval': 10.0
+            },
             'colors': {
                 'cyan': (255, 255, 0),
                 'green': (0, 255, 0),
@@ -187,4 +381,74 @@ class ConfigManager:
                 config[k] = {}
             config = config[k]
         
-        config[keys[-1]] = value
\ No newline at end of file
+        config[keys[-1]] = value
+    
+    def resolve_path(self, path):
+        """Resolve a relative path from the config against the config file's directory"""
+        if not path or os.path.isabs(path) or self.path is None:
+            return path
+        return os.path.join(os.path.dirname(os.path.abspath(self.path)), path)
+    
+    def snapshot(self):
+        """Independent copy of the current configuration"""
+        return copy.deepcopy(self.config)
+    
+    def reload_if_changed(self):
+        """Reload the config file if it changed on disk; returns True on reload"""
+        if self.path is None:
+            return False
+        
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        
+        try:
+            with open(self.path) as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Config reload failed, keeping previous settings: {e}")
+            return False
+        
+        config = self.defaults()
+        _merge_config(config, overrides)
+        # Swap the whole dict so readers never see a half-applied update
+        self.config = config
+        self.version += 1
+        return True
+    
+    def watch(self, callback, interval=1.0):
+        """Poll the config file on a background thread and call callback(snapshot) on change"""
+        if self._watch_thread is not None:
+            return
+        
+        def poll():
+            while self._watching:
+                time.sleep(interval)
+                if self.reload_if_changed():
+                    try:
+                        callback(self.snapshot())
+                    except Exception as e:
+                        print(f"⚠️  Config change could not be applied, keeping previous settings: {e}")
+        
+        self._watching = True
+        self._watch_thread = threading.Thread(target=poll, name="ConfigWatcher", daemon=True)
+        self._watch_thread.start()
+    
+    def stop(self):
+        """Stop watching the config file"""
+        self._watching = False
+        self._watch_thread = None
+
+def _merge_config(base, overrides):
+    """Recursively overlay overrides onto base; JSON colour lists become BGR tuples"""
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge_config(base[key], value)
+        elif isinstance(value, list):
+            base[key] = tuple(value)
+        else:
+            base[key] = value
\ No newline at end of file